@@ -0,0 +1,58 @@
+# Authored by AI: Google's Gemini Model
+"""Compares the trie-based BadWordMatcher against the old single-alternation regex at 100, 1k and 10k words."""
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'discord_parser')))
+from logic.bad_words import BadWordMatcher, BAD_WORDS_PATH
+
+MESSAGE_COUNT = 20_000
+WORD_LIST_SIZES = [100, 1_000, 10_000]
+FILLER = "the a to and is it you that of in i for on lol this was just like what yeah but have my so with are".split()
+
+def build_word_list(size, rng):
+    with open(BAD_WORDS_PATH, 'r', encoding='utf-8') as f: words = [line.strip().lower() for line in f if line.strip()]
+    words = words[:size]
+    while len(words) < size: words.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10))))
+    return words
+
+def build_messages(words, rng):
+    messages = []
+    for _ in range(MESSAGE_COUNT):
+        tokens = [rng.choice(words) if rng.random() < 0.05 else rng.choice(FILLER) for _ in range(rng.randint(1, 25))]
+        messages.append(' '.join(tokens))
+    return messages
+
+def run_regex(pattern, messages):
+    """The previous _format_content behaviour: finditer to count, then a second scan with sub."""
+    counter = Counter(); output = []
+    for message in messages:
+        matches = list(pattern.finditer(message))
+        if matches:
+            for match in matches: counter[match.group(0).lower()] += 1
+            message = pattern.sub('<snip>', message)
+        output.append(message)
+    return output, counter
+
+def run_matcher(matcher, messages):
+    counter = Counter()
+    return [matcher.sub(message, '<snip>', counter) for message in messages], counter
+
+def main():
+    rng = random.Random(42)
+    print(f"{'words':>7} | {'regex build':>11} | {'regex scan':>10} | {'trie build':>10} | {'trie scan':>9} | {'speedup':>7} | same output")
+    for size in WORD_LIST_SIZES:
+        words = build_word_list(size, rng); messages = build_messages(words, rng)
+        start = time.perf_counter(); pattern = re.compile(r'\b(' + '|'.join(re.escape(w) for w in words) + r')\b', re.IGNORECASE); regex_build = time.perf_counter() - start
+        start = time.perf_counter(); regex_output, regex_counts = run_regex(pattern, messages); regex_scan = time.perf_counter() - start
+        start = time.perf_counter(); matcher = BadWordMatcher(words); trie_build = time.perf_counter() - start
+        start = time.perf_counter(); trie_output, trie_counts = run_matcher(matcher, messages); trie_scan = time.perf_counter() - start
+        same = sum(a == b for a, b in zip(regex_output, trie_output)) / len(messages)
+        print(f"{size:>7,} | {regex_build:>10.3f}s | {regex_scan:>9.3f}s | {trie_build:>9.3f}s | {trie_scan:>8.3f}s | {regex_scan / trie_scan:>6.1f}x | {same:.2%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Authored by AI: Google's Gemini Model
+"""Compares streaming word statistics (exact hashed set and HyperLogLog) against the old str.cat implementation."""
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'discord_parser')))
+from logic.word_stats import make_word_counter
+
+MESSAGE_COUNT = 300_000
+VOCABULARY_SIZE = 200_000
+CHUNK_SIZE = 100_000
+
+def build_content(seed=7):
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i:x}" for i in range(VOCABULARY_SIZE)], dtype=object)
+    lengths = rng.integers(1, 20, MESSAGE_COUNT); words = vocabulary[np.minimum(rng.zipf(1.2, lengths.sum()) - 1, VOCABULARY_SIZE - 1)]
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    return pd.Series([' '.join(words[offsets[i]:offsets[i + 1]]) for i in range(MESSAGE_COUNT)], dtype=object)
+
+def legacy(content):
+    all_words = content.str.cat(sep=' ').split()
+    return len(all_words), len(set(word.lower() for word in all_words))
+
+def streaming(content, mode):
+    counter = make_word_counter(mode)
+    for start in range(0, len(content), CHUNK_SIZE): counter.update(content.iloc[start:start + CHUNK_SIZE])
+    return counter.total, counter.unique
+
+def measure(func, *args):
+    """Times one untraced run, then repeats it under tracemalloc for the peak, so tracing never inflates the timing."""
+    start = time.perf_counter(); result = func(*args); elapsed = time.perf_counter() - start
+    tracemalloc.start(); func(*args); _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    content = build_content()
+    print(f"{MESSAGE_COUNT:,} messages, chunk size {CHUNK_SIZE:,}")
+    print(f"{'implementation':<22} | {'total':>10} | {'unique':>9} | {'time':>7} | {'peak memory':>11}")
+    for name, func, args in [("str.cat + set (old)", legacy, (content,)), ("streaming exact", streaming, (content, 'exact')), ("streaming approximate", streaming, (content, 'approximate'))]:
+        (total, unique), elapsed, peak = measure(func, *args)
+        print(f"{name:<22} | {total:>10,} | {unique:>9,} | {elapsed:>6.2f}s | {peak / 1024 / 1024:>8.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Authored by AI: Google's Gemini Model
+"""
+Seeded generator of synthetic Discord exports (AuthorID, Author, Date, Content, Attachments, Reactions).
+
+    python benchmarks/generate_discord_csv.py --rows 1000000 --seed 1 data/discord_1m.csv
+
+Author activity is Zipfian, message times follow a daily rhythm, and content mixes common words with URLs,
+bad words, "name: " prefixes, multi-line messages and empty messages. Rows are generated and written in
+chunks, so even 20M-row files need little memory; the same rows and seed always give the same file.
+"""
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'discord_parser')))
+from logic.bad_words import BAD_WORDS_PATH
+
+CHUNK_ROWS = 100_000
+START_DATE = '2020-01-01'
+MEAN_GAP_SECONDS = 45  # average time between two messages
+VOCABULARY = ("the a to and is it you that of in i for on lol this was just like what yeah but have my so with are "
+              "not be at me we if do can they all get there your no one out up about when he she how good think know "
+              "time now game play server discord channel message voice bot role ping gg nice true wait ok sure").split()
+DOMAINS = ['https://www.youtube.com/watch?v=', 'https://youtu.be/', 'https://twitter.com/user/status/', 'https://github.com/org/repo/issues/',
+           'https://en.wikipedia.org/wiki/Article_', 'www.example.com/page/', 'https://tenor.com/view/gif-', 'https://www.reddit.com/r/sub/comments/']
+REACTIONS = ['👍', '😂', '❤️', '🔥', '👀', '😭', 'KEKW', 'pepega']
+URL_RATE = 0.08
+BAD_WORD_RATE = 0.03  # per message
+PREFIX_RATE = 0.02  # messages starting with "author: ", which the scrub option removes
+MULTILINE_RATE = 0.05
+EMPTY_RATE = 0.03  # attachment-only messages
+ATTACHMENT_RATE = 0.08
+REACTION_RATE = 0.12
+
+def _bad_words():
+    with open(BAD_WORDS_PATH, 'r', encoding='utf-8') as f: return [line.strip() for line in f if line.strip() and ' ' not in line.strip()][:500]
+
+def make_authors(count, rng):
+    """(ids, names, activity weights): a few very active authors and a long tail, as in real servers."""
+    ids = 100_000_000_000_000_000 + rng.choice(10 ** 17, size=count, replace=False)
+    names = np.array([f"user_{i}" if i % 7 else f"Üser {i}" for i in range(count)], dtype=object)
+    weights = 1.0 / np.arange(1, count + 1) ** 1.1
+    return ids, names, weights / weights.sum()
+
+def _message_times(rng, rows, start):
+    """Cumulative exponential gaps, stretched at night so activity follows a daily cycle."""
+    gaps = rng.exponential(MEAN_GAP_SECONDS, rows)
+    hours = ((start + np.cumsum(gaps)) / 3600) % 24
+    gaps *= 1 + 2.5 * (np.cos((hours - 21) / 24 * 2 * np.pi) < -0.5)
+    return start + np.cumsum(gaps)
+
+def _content(rng, rows, author_names, bad_words):
+    vocabulary = np.array(VOCABULARY, dtype=object); ranks = 1.0 / np.arange(1, len(vocabulary) + 1); ranks /= ranks.sum()
+    lengths = np.minimum(rng.geometric(0.12, rows), 80); offsets = np.concatenate([[0], np.cumsum(lengths)])
+    words = vocabulary[rng.choice(len(vocabulary), size=offsets[-1], p=ranks)]
+    for rate, values in [(URL_RATE, [f"{domain}{rng.integers(10 ** 6)}" for domain in DOMAINS for _ in range(50)]), (BAD_WORD_RATE, bad_words)]:
+        hit_rows = np.flatnonzero(rng.random(rows) < rate)
+        positions = offsets[hit_rows] + (rng.random(len(hit_rows)) * lengths[hit_rows]).astype(np.int64)
+        words[positions] = np.array(values, dtype=object)[rng.integers(len(values), size=len(positions))]
+    content = np.array([' '.join(words[offsets[i]:offsets[i + 1]]) for i in range(rows)], dtype=object)
+    multiline = np.flatnonzero(rng.random(rows) < MULTILINE_RATE)
+    content[multiline] = [message.replace(' ', '\n', 1 + i % 3) for i, message in zip(multiline, content[multiline])]
+    prefixed = rng.random(rows) < PREFIX_RATE; content[prefixed] = author_names[prefixed] + ': ' + content[prefixed]
+    content[rng.random(rows) < EMPTY_RATE] = ''
+    return content
+
+def _reactions(rng, rows):
+    reactions = np.full(rows, '', dtype=object)
+    for row in np.flatnonzero(rng.random(rows) < REACTION_RATE):
+        picked = rng.choice(len(REACTIONS), size=rng.integers(1, 4), replace=False)
+        reactions[row] = ','.join(f"{REACTIONS[i]} ({rng.integers(1, 20)})" for i in picked)
+    return reactions
+
+def generate(path, rows, seed=0, authors=None, chunk_rows=CHUNK_ROWS):
+    """Writes `rows` synthetic messages to `path`; `authors` defaults to one per 2,000 messages (at least 50)."""
+    rng = np.random.default_rng(seed); bad_words = _bad_words()
+    ids, names, weights = make_authors(authors or min(max(50, rows // 2_000), 50_000), rng)
+    clock = pd.Timestamp(START_DATE, tz='UTC').value / 10 ** 9
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, rows, chunk_rows):
+            count = min(chunk_rows, rows - start)
+            who = rng.choice(len(ids), size=count, p=weights)
+            seconds = _message_times(rng, count, clock); clock = seconds[-1]
+            dates = np.char.add(np.datetime_as_string((seconds * 1000).astype('datetime64[ms]'), unit='ms'), '+00:00')
+            attachments = np.full(count, '', dtype=object); with_file = np.flatnonzero(rng.random(count) < ATTACHMENT_RATE)
+            attachments[with_file] = [f"https://cdn.discordapp.com/attachments/{channel}/image{row}.png?ex=65f1" for channel, row in zip(rng.integers(10 ** 17, size=len(with_file)), with_file)]
+            chunk = pd.DataFrame({'AuthorID': ids[who], 'Author': names[who], 'Date': dates, 'Content': _content(rng, count, names[who], bad_words),
+                                  'Attachments': attachments, 'Reactions': _reactions(rng, count)})
+            chunk.to_csv(f, index=False, header=start == 0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Discord CSV export.")
+    parser.add_argument('output', help="CSV file to write")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--authors', type=int, help="number of distinct authors (default: rows / 2000, at least 50)")
+    args = parser.parse_args(argv)
+    generate(args.output, args.rows, args.seed, args.authors)
+
+if __name__ == "__main__":
+    main()
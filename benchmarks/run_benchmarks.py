@@ -0,0 +1,149 @@
+# Authored by AI: Google's Gemini Model
+"""
+End-to-end benchmark of the parser's stages on synthetic Discord exports.
+
+    python benchmarks/run_benchmarks.py --sizes 10k,100k,1m --output results.json
+    python benchmarks/run_benchmarks.py --sizes 10k,100k,1m --output new.json --compare results.json
+
+For every size a seeded CSV is generated (and kept in --data-dir for later runs), then loading, date
+filtering, each analytics summary, the frequency graph and an export per format are timed. Every stage is
+run once for wall time and, unless --no-memory is given, once more under tracemalloc for peak Python/NumPy
+memory, so tracing never inflates the timings. Results are written as JSON; --compare prints the change
+against an earlier results file.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'discord_parser')))
+from generate_discord_csv import generate
+from cli import DEFAULT_SETTINGS
+from logic.file_handler import load_csv_file
+from logic.data_processor import export_data, filter_dataframe_by_date
+from logic.analytics_handler import get_author_summary, get_datetime_summary, get_content_summary, get_attachment_summary
+from logic.analytics_cache import clear_analytics_cache
+from logic.rollups import clear_rollups
+from logic.features import clear_bad_word_hits
+from logic.graph_handler import create_frequency_graph
+from logic.export_writers import available_formats
+
+DEFAULT_SIZES = '10k,100k,1m'
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+REGRESSION_THRESHOLD = 1.10  # --compare flags stages at least this much slower than the baseline...
+REGRESSION_MIN_SECONDS = 0.05  # ...and slower by at least this much, so millisecond stages don't flag timer noise
+# Exports run with the content stages that cost the most enabled, so they are measured rather than skipped
+EXPORT_SETTINGS = dict(DEFAULT_SETTINGS, bad_word_filter_mode='snip_word', shorten_urls=True, url_format_mode='tag_domain', scrub_author_from_content=True, author_format='name_only')
+
+def parse_size(text):
+    text = text.strip().lower(); multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+def dataset_path(data_dir, rows, seed):
+    path = os.path.join(data_dir, f"discord_{rows}_seed{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True); print(f"Generating {rows:,} rows -> {path}", flush=True)
+        generate(path + '.partial', rows, seed); os.replace(path + '.partial', path)
+    return path
+
+def _fresh():
+    """Drops memoized analytics, rollups and bad-word counts so every run measures the uncached work."""
+    clear_analytics_cache(); clear_rollups(); clear_bad_word_hits(); gc.collect()
+
+def measure(func, memory=True):
+    """Returns (result, seconds, peak bytes or None); the peak comes from a second, traced run."""
+    _fresh(); start = time.perf_counter(); result = func(); seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        del result; _fresh(); tracemalloc.start()
+        try: result = func(); peak = tracemalloc.get_traced_memory()[1]
+        finally: tracemalloc.stop()
+    return result, seconds, peak
+
+def run_size(path, rows, formats, output_dir, memory):
+    records = []
+    def record(stage, func, processed_rows, export_format=None, output_path=None):
+        result, seconds, peak = measure(func, memory)
+        entry = {"rows": rows, "stage": stage, "format": export_format, "seconds": round(seconds, 4), "processed_rows": processed_rows,
+                 "rows_per_s": round(processed_rows / seconds) if seconds else None, "peak_mb": round(peak / 1024 ** 2, 1) if peak is not None else None}
+        if output_path and os.path.exists(output_path): entry["output_bytes"] = os.path.getsize(output_path)
+        records.append(entry)
+        print(f"  {stage + (f' [{export_format}]' if export_format else ''):<22} {seconds:>8.3f}s {entry['rows_per_s'] or 0:>12,} rows/s"
+              + (f" {entry['peak_mb']:>9.1f} MB" if peak is not None else ""), flush=True)
+        return result
+
+    data = record("load", lambda: load_csv_file(path, use_cache=False), rows)
+    df = data['dataframe']; first, last = df['Date'].min(), df['Date'].max()
+    start, end = first + (last - first) / 4, last - (last - first) / 4
+    record("filter", lambda: filter_dataframe_by_date(df, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')), len(df))
+    settings = dict(EXPORT_SETTINGS, first_date_timestamp=first, last_date_timestamp=last)
+    record("analytics_authors", lambda: get_author_summary(df, data['author_index'], settings), len(df))
+    record("analytics_datetime", lambda: get_datetime_summary(df), len(df))
+    record("analytics_content", lambda: get_content_summary(df, settings), len(df))
+    record("analytics_attachments", lambda: get_attachment_summary(df, settings), len(df))
+    for scale in ['day', 'hour']: record(f"graph_{scale}", lambda: create_frequency_graph(df, scale), len(df))
+    for export_format in formats:
+        save_path = os.path.join(output_dir, f"export_{rows}.{export_format}")
+        record("export", lambda: export_data(df, settings, export_format, save_path, lambda percentage, message: None, author_index=data['author_index']), len(df), export_format, save_path)
+    return records
+
+def compare(records, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f: baseline = json.load(f)
+    previous = {(r['rows'], r['stage'], r['format']): r for r in baseline['results']}
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('timestamp', '?')}):")
+    print(f"{'rows':>10} {'stage':<24} {'before':>9} {'after':>9} {'change':>8}")
+    regressions = 0
+    for r in records:
+        old = previous.get((r['rows'], r['stage'], r['format']))
+        if not old or not old['seconds']: continue
+        ratio = r['seconds'] / old['seconds']; flag = "  SLOWER" if ratio >= REGRESSION_THRESHOLD and r['seconds'] - old['seconds'] >= REGRESSION_MIN_SECONDS else ""
+        regressions += bool(flag)
+        stage = r['stage'] + (f" [{r['format']}]" if r['format'] else "")
+        print(f"{r['rows']:>10,} {stage:<24} {old['seconds']:>8.3f}s {r['seconds']:>8.3f}s {ratio - 1:>+7.0%}{flag}")
+    return regressions
+
+def _versions():
+    versions = {"python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__}
+    try:
+        import pyarrow; versions["pyarrow"] = pyarrow.__version__
+    except ImportError: pass
+    return versions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark loading, filtering, analytics, graphing and exporting.")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"comma-separated row counts, k/m suffixes allowed (default: {DEFAULT_SIZES}; up to 20m)")
+    parser.add_argument('--formats', default=','.join(available_formats()), help="export formats to benchmark (default: all available)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="where generated datasets are kept between runs")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--compare', help="earlier results JSON to compare against")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced run that measures peak memory")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    sizes = [parse_size(size) for size in args.sizes.split(',')]; formats = [fmt.strip() for fmt in args.formats.split(',')]
+    output_dir = os.path.join(args.data_dir, 'exports'); os.makedirs(output_dir, exist_ok=True)
+    records = []
+    for rows in sizes:
+        path = dataset_path(args.data_dir, rows, args.seed)
+        print(f"\n{rows:,} rows ({os.path.getsize(path) / 1024 ** 2:.1f} MB CSV)", flush=True)
+        records += run_size(path, rows, formats, output_dir, not args.no_memory)
+
+    meta = {"timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'), "seed": args.seed, "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "memory_traced": not args.no_memory, **_versions()}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: json.dump({"meta": meta, "results": records}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare: return 1 if compare(records, args.compare) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
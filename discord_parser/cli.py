@@ -0,0 +1,173 @@
+# Authored by AI: Google's Gemini Model
+"""
+Headless batch mode: loads, filters and exports many Discord CSV files without the GUI.
+
+    python discord_parser/cli.py --settings settings.json --output-dir out "exports/*.csv"
+
+The settings file holds the same keys ConfigTabs.get_all_settings produces; missing keys fall back to the GUI defaults.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from utils.logger_setup import logger
+from logic.file_handler import load_csv_file
+from logic.data_processor import export_data, filter_dataframe_by_date
+from logic.export_writers import TXT_LAYOUTS, available_codecs, available_formats
+
+DEFAULT_SETTINGS = {
+    "author_format": "name", "create_key_file": True, "selected_author_ids": [], "nicknames": {}, "group_consecutive": False, "scrub_author_from_content": False,
+    "date_format": "show",
+    "trim_logic": "AND", "trim_chars_min_enabled": True, "trim_chars_min": 1, "trim_chars_max_enabled": True, "trim_chars_max": 2000,
+    "trim_words_min_enabled": False, "trim_words_min": 0, "trim_words_max_enabled": False, "trim_words_max": 1000,
+    "bad_word_filter_mode": "disabled", "snip_replacement": "<snip>", "shorten_urls": False, "url_format_mode": "tag_generic",
+    "normalize_whitespace": False, "omit_brackets": False, "parallel_workers": 0,
+    "include_attachments": True, "attachment_format": "tag", "include_reactions": True, "txt_layout": "table",
+}
+
+def load_settings(path):
+    """Reads a settings JSON file over DEFAULT_SETTINGS. JSON object keys are strings, so nickname IDs are converted back to ints."""
+    settings = dict(DEFAULT_SETTINGS)
+    if path:
+        with open(path, 'r', encoding='utf-8') as f: settings.update(json.load(f))
+    settings['nicknames'] = {int(author_id): name for author_id, name in settings.get('nicknames', {}).items()}
+    settings['selected_author_ids'] = [int(author_id) for author_id in settings.get('selected_author_ids', [])]
+    return settings
+
+def expand_inputs(patterns):
+    """
+    Expands files and glob patterns into a sorted, de-duplicated list of (CSV path, output name) pairs, plus the list
+    of explicit (non-glob) paths that are not files, which the caller reports as failed inputs. The output name
+    is the file's stem; files sharing a stem (e.g. general.csv in several folders of a ** glob) are named by their path
+    below the folder they have in common instead, so one export cannot overwrite another.
+    Raises ValueError for files whose output names still clash (same folder, different extension).
+    """
+    paths = set(); missing = []
+    for pattern in patterns:
+        if not glob.has_magic(pattern) and not os.path.isfile(pattern):
+            missing.append(pattern); continue
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        paths.update(os.path.abspath(path) for path in matches if os.path.isfile(path))
+    paths = sorted(paths); by_stem = {}
+    for path in paths: by_stem.setdefault(os.path.normcase(os.path.splitext(os.path.basename(path))[0]), []).append(path)
+    names = {}
+    for group in by_stem.values():
+        common = os.path.commonpath([os.path.dirname(path) for path in group])
+        for path in group: names[path] = os.path.splitext(os.path.relpath(path, common) if len(group) > 1 else os.path.basename(path))[0]
+    clashes = {}
+    for path, name in names.items(): clashes.setdefault(os.path.normcase(name), []).append(path)
+    clashes = [group for group in clashes.values() if len(group) > 1]
+    if clashes: raise ValueError("inputs would export to the same file: " + "; ".join(", ".join(group) for group in clashes))
+    return [(path, names[path]) for path in paths], missing
+
+def _init_worker(log_level):
+    logging.getLogger().setLevel(log_level)
+
+def process_file(filepath, output_name, settings, output_dir, export_format, start_date=None, end_date=None, use_cache=True, compression=None, compression_level=None, metrics_dir=None):
+    """
+    Loads, optionally date-filters and exports one file to <output_dir>/<output_name>.<format>, where `output_name` is
+    a relative path without extension (see expand_inputs). Returns a dict of counts and per-stage timings.
+    With `metrics_dir`, the export's stage metrics are saved there as <output_name>.metrics.json and <output_name>.trace.json.
+    """
+    stem = os.path.basename(output_name)
+    # export_key.txt is written next to the export, so files that produce one each get their own folder
+    writes_key = settings.get('create_key_file') and settings.get('author_format') in ('anonymize', 'numeric_keys')
+    target_dir = os.path.join(output_dir, output_name) if writes_key else os.path.join(output_dir, os.path.dirname(output_name))
+    os.makedirs(target_dir, exist_ok=True)
+    save_path = os.path.join(target_dir, f"{stem}.{export_format}")
+    stats = {"file": filepath, "name": output_name, "success": False, "input_bytes": os.path.getsize(filepath)}
+
+    started = time.perf_counter()
+    data = load_csv_file(filepath, use_cache=use_cache)
+    stats["load_s"] = time.perf_counter() - started
+    if not data:
+        stats["error"] = "could not load file"; return stats
+    loaded_df = df = data['dataframe']; stats["messages"] = len(df)
+
+    started = time.perf_counter()
+    if start_date or end_date:
+        df = filter_dataframe_by_date(df, start_date or data['first_date'].split(' ')[0], end_date or data['last_date'].split(' ')[0])
+    stats["filter_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    # Relative dates count from the whole loaded file, as in the GUI, not from the date-filtered rows
+    file_settings = dict(settings, first_date_timestamp=loaded_df['Date'].min(), last_date_timestamp=loaded_df['Date'].max())
+    result = export_data(df, file_settings, export_format, save_path, lambda percentage, message: None, compression=compression, compression_level=compression_level, author_index=data['author_index'])
+    stats["export_s"] = time.perf_counter() - started
+    if not result.get("success"):
+        stats["error"] = result.get("error", "export failed"); return stats
+    if metrics_dir:
+        metrics_path = os.path.join(metrics_dir, output_name); os.makedirs(os.path.dirname(metrics_path), exist_ok=True)
+        result['metrics'].dump_json(f"{metrics_path}.metrics.json"); result['metrics'].dump_chrome_trace(f"{metrics_path}.trace.json")
+    stats.update(success=True, save_path=result['final_path'], lines=int(result['line_count'].replace(',', '')), output_bytes=os.path.getsize(result['final_path']))
+    return stats
+
+def _format_stats(stats):
+    name = stats['name']
+    if not stats['success']: return f"FAILED  {name}: {stats.get('error')}"
+    total = stats['load_s'] + stats['filter_s'] + stats['export_s']
+    throughput = stats['input_bytes'] / 1024 / 1024 / total if total else 0.0
+    return (f"OK      {name}: {stats['messages']:,} messages -> {stats['lines']:,} lines | load {stats['load_s']:.2f}s, "
+            f"filter {stats['filter_s']:.2f}s, export {stats['export_s']:.2f}s | {throughput:.1f} MB/s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Discord CSV files without the GUI.")
+    parser.add_argument('inputs', nargs='+', help="CSV files or glob patterns (quote globs to let the CLI expand them)")
+    parser.add_argument('--settings', help="JSON file with export settings (keys as produced by the GUI)")
+    parser.add_argument('--output-dir', required=True, help="directory to write exports into")
+    parser.add_argument('--format', choices=available_formats(), default='csv', help="export format (default: csv; parquet and arrow need pyarrow)")
+    parser.add_argument('--txt-layout', choices=TXT_LAYOUTS, help="layout of TXT exports: aligned table, fixed column widths or chat log (default: settings file, else table)")
+    parser.add_argument('--compression', choices=available_codecs(), help="compress each export while it is written")
+    parser.add_argument('--level', type=int, help="compression level (default: the codec's default)")
+    parser.add_argument('--start-date', help="only export messages from this date (YYYY-MM-DD)")
+    parser.add_argument('--end-date', help="only export messages up to this date (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="files processed in parallel (default: CPU count)")
+    parser.add_argument('--metrics-dir', help="save each export's stage metrics (JSON) and Chrome trace here")
+    parser.add_argument('--no-cache', action='store_true', help="do not read or write the parsed-data cache")
+    parser.add_argument('--verbose', action='store_true', help="show the application log")
+    args = parser.parse_args(argv)
+
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    logging.getLogger().setLevel(log_level)
+    try: files, missing = expand_inputs(args.inputs)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr); return 2
+    if not files and not missing:
+        print("No input files matched.", file=sys.stderr); return 2
+    settings = load_settings(args.settings)
+    if args.txt_layout: settings['txt_layout'] = args.txt_layout
+    workers = max(1, min(args.workers, len(files)))
+    if workers > 1: settings['parallel_workers'] = 0  # files are already spread across processes; no nested pools
+    logger.info(f"Processing {len(files)} files with {workers} worker processes.")
+
+    started = time.perf_counter(); results = [{"file": path, "name": path, "success": False, "error": "no such file"} for path in missing]
+    for stats in results: print(_format_stats(stats), flush=True)
+    file_args = [(path, output_name, settings, args.output_dir, args.format, args.start_date, args.end_date, not args.no_cache, args.compression, args.level, args.metrics_dir) for path, output_name in files]
+    if workers == 1:
+        for file_arg in file_args:
+            try: stats = process_file(*file_arg)
+            except Exception as e: stats = {"file": file_arg[0], "name": file_arg[1], "success": False, "error": str(e)}
+            results.append(stats); print(_format_stats(stats), flush=True)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(log_level,)) as pool:
+            futures = {pool.submit(process_file, *file_arg): file_arg for file_arg in file_args}
+            for future in as_completed(futures):
+                try: stats = future.result()
+                except Exception as e: stats = {"file": futures[future][0], "name": futures[future][1], "success": False, "error": str(e)}
+                results.append(stats); print(_format_stats(stats), flush=True)
+
+    elapsed = time.perf_counter() - started
+    succeeded = [stats for stats in results if stats['success']]
+    input_mb = sum(stats['input_bytes'] for stats in succeeded) / 1024 / 1024
+    print(f"\n{len(succeeded)}/{len(results)} files exported in {elapsed:.2f}s "
+          f"({sum(stats['messages'] for stats in succeeded):,} messages, {input_mb:.1f} MB, {input_mb / elapsed if elapsed else 0:.1f} MB/s)")
+    return 0 if len(succeeded) == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# Authored by AI: Google's Gemini Model
+from utils.logger_setup import logger
+import functools
+import threading
+import weakref
+from collections import OrderedDict
+
+ANALYTICS_CACHE_SIZE = 128  # summaries are short strings, so a few hundred entries stay well under a megabyte
+
+_cache = OrderedDict()  # (summary, id(frame), settings key) -> summary text, least recently used first
+_tracked_frames = set()
+_cache_lock = threading.Lock()
+
+def _freeze(value):
+    """Turns settings values (lists, dicts, sets) into hashable equivalents for use in a cache key."""
+    if isinstance(value, dict): return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)): return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)): return frozenset(_freeze(v) for v in value)
+    return value
+
+def _forget_frame(frame_id):
+    with _cache_lock:
+        _tracked_frames.discard(frame_id)
+        for key in [key for key in _cache if key[1] == frame_id]: del _cache[key]
+
+def memoize_analytics(key_func):
+    """
+    Caches a summary function by the identity of its DataFrame plus `key_func(df, *args)`, which should return
+    only the settings the summary depends on. Entries for a frame are dropped when it is garbage collected,
+    and the shared cache evicts least recently used entries beyond ANALYTICS_CACHE_SIZE. Keyword arguments (such as
+    a cancel_token) are passed through and never part of the key; a cancelled run raises and is not cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(df, *args, **kwargs):
+            if df is None or df.empty: return func(df, *args, **kwargs)
+            key = (func.__name__, id(df), _freeze(key_func(df, *args)))
+            with _cache_lock:
+                if key in _cache:
+                    _cache.move_to_end(key); logger.info(f"Analytics cache hit for {func.__name__}."); return _cache[key]
+            result = func(df, *args, **kwargs)
+            with _cache_lock:
+                if id(df) not in _tracked_frames:
+                    _tracked_frames.add(id(df)); weakref.finalize(df, _forget_frame, id(df))
+                _cache[key] = result
+                while len(_cache) > ANALYTICS_CACHE_SIZE: _cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
+def clear_analytics_cache():
+    with _cache_lock: _cache.clear()
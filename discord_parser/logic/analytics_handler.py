@@ -1,69 +1,85 @@
 # Authored by AI: Google's Gemini Model
 from utils.logger_setup import logger
+import numpy as np
 import pandas as pd
-from collections import Counter
-from logic.data_processor import _format_content, _scrub_author_from_content
+from logic.data_processor import process_content
+from logic.content_pipeline import ContentPipeline
+from logic.features import get_content_features
+from logic.rollups import get_rollups
+from logic.analytics_cache import memoize_analytics
 
 def _header(title):
     return f"{title.upper()}\n" + "=" * 35 + "\n"
 
-def get_author_summary(df, author_data, settings):
+@memoize_analytics(lambda df, author_index, settings: (settings.get('selected_author_ids', []), ContentPipeline(settings).scrub_targets, author_index))
+def get_author_summary(df, author_index, settings):
     if df is None or df.empty: return "No data to analyze."
-    selected_ids = settings.get('selected_author_ids', [])
-    selected_author_data = [a for a in author_data if a['id'] in selected_ids]
+    selected = author_index.mask(settings.get('selected_author_ids', []))
     
-    scrubbed_chars = 0
-    if settings.get('scrub_author_from_content'):
-        for row in df.itertuples():
-            if row.AuthorID in selected_ids:
-                original_len = len(row.Content) if isinstance(row.Content, str) else 0
-                scrubbed_content = _scrub_author_from_content(row.Content, row.Author, row.AuthorID, settings)
-                scrubbed_chars += original_len - len(scrubbed_content)
+    rows = author_index.row_mask(df, selected)
+    filtered_df = df[rows]
+    total_messages = int(rows.sum())
 
-    filtered_df = df[df['AuthorID'].isin(selected_ids)]
-    total_messages = len(filtered_df)
+    scrubbed_chars = 0; pipeline = ContentPipeline(settings)
+    if pipeline.scrub_targets:
+        content = filtered_df['Content'].dropna().astype(object)
+        scrubbed = pipeline.scrub_many(content.copy(), filtered_df.loc[content.index, 'Author'], filtered_df.loc[content.index, 'AuthorID'])
+        scrubbed_chars = int(content.str.len().sum() - scrubbed.str.len().sum())
     
-    summary = _header(f"Author Analytics ({len(selected_ids)}/{len(author_data)} Selected)")
+    selected &= author_index.named
+    summary = _header(f"Author Analytics ({int(selected.sum())}/{int(author_index.named.sum())} Selected)")
     summary += f"Messages from selection: {total_messages:,}\n"
     if scrubbed_chars > 0:
         summary += f"Characters scrubbed from content: {scrubbed_chars:,}\n"
     summary += "\nTop 5 Selected Authors by Message Count:\n"
-    sorted_authors = sorted(selected_author_data, key=lambda x: x['count'], reverse=True)
-    for i, author in enumerate(sorted_authors[:5]):
-        percentage = (author['count'] / total_messages) * 100 if total_messages > 0 else 0
-        summary += f"  {i+1}. {author['name']} ({author['count']:,}, {percentage:.1f}%)\n"
+    codes = np.flatnonzero(selected)
+    top_codes = codes[np.argsort(-author_index.message_counts[codes], kind='stable')[:5]]
+    for i, code in enumerate(top_codes):
+        count = int(author_index.message_counts[code])
+        percentage = (count / total_messages) * 100 if total_messages > 0 else 0
+        summary += f"  {i+1}. {author_index.names[code]} ({count:,}, {percentage:.1f}%)\n"
     return summary
 
+@memoize_analytics(lambda df: ())
 def get_datetime_summary(df):
     if df is None or df.empty: return "No data to analyze."
     summary = _header(f"Date & Time Summary ({len(df):,} Messages)")
-    day_counts = df['Date'].dt.day_name().value_counts()
+    rollups = get_rollups(df); day_counts = rollups.day_of_week_totals()
     summary += "Messages by Day of the Week:\n"
     for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
         summary += f"  - {day:<9}: {day_counts.get(day, 0):,}\n"
     summary += "\nMessages by Hour of the Day (UTC):\n"
-    hour_counts = df['Date'].dt.hour.value_counts().sort_index()
+    hour_counts = rollups.hour_of_day_totals()
     for hour, count in hour_counts.items():
         summary += f"  - Hour {hour:02d}: {count:,}\n"
     return summary
 
-def get_content_summary(df, settings):
+@memoize_analytics(lambda df, settings: ContentPipeline(settings).cache_key())
+def get_content_summary(df, settings, cancel_token=None):
     if df is None or df.empty: return "No data to analyze."
     
-    original_chars, processed_chars, removed_messages = 0, 0, 0
-    snipped_words_counter = Counter()
-    
-    for row in df.itertuples():
-        original_len = len(row.Content) if isinstance(row.Content, str) else 0
-        original_chars += original_len
-        processed = _format_content(row.Content, row.Author, row.AuthorID, settings, snipped_words_counter)
-        if processed is None: removed_messages += 1
-        else: processed_chars += len(processed)
+    pipeline = ContentPipeline(settings); features = get_content_features(df, pipeline.matcher, bool(pipeline.bad_word_mode))
+    if features is not None and not pipeline.transforms_content:
+        # Trim-only settings are answered from the precomputed features without touching the text
+        has_text = df['Content'].notna(); keep, snipped = pipeline.feature_masks(features); keep &= has_text; snipped &= has_text
+        original_chars = int(features['CharCount'].sum())
+        processed_chars = int(features['CharCount'][keep & ~snipped].sum()) + len(pipeline.removed_tag) * int(snipped.sum())
+        removed_messages = int((~keep).sum())
+    else:
+        processed = process_content(df, pipeline, cancel_token=cancel_token)
+        original_chars = int(df['Content'].str.len().fillna(0).sum())
+        processed_chars = int(processed.dropna().str.len().sum())
+        removed_messages = int(processed.isna().sum())
+    snipped_words_counter = pipeline.snipped_words
 
     total_messages = len(df)
     summary = _header(f"Content Analytics Dry Run")
     summary += f"Messages that would be REMOVED by trimming: {removed_messages:,}\n"
-    summary += f"Characters SAVED/REMOVED by all operations: {original_chars - processed_chars:,}\n\n"
+    summary += f"Characters SAVED/REMOVED by all operations: {original_chars - processed_chars:,}\n"
+    if features is not None:
+        if pipeline.url_format: summary += f"Messages containing links: {int(features['HasURL'].sum()):,}\n"
+        if pipeline.bad_word_mode: summary += f"Messages containing bad words: {int((features['BadWordHits'] > 0).sum()):,}\n"
+    summary += "\n"
     
     if snipped_words_counter:
         summary += f"Total words that would be SNIPPED: {sum(snipped_words_counter.values()):,}\n"
@@ -72,6 +88,7 @@ def get_content_summary(df, settings):
             summary += f"  {i+1}. '{word}' ({count:,} times)\n"
     return summary
     
+@memoize_analytics(lambda df, settings: (settings.get('include_attachments'), settings.get('include_reactions')))
 def get_attachment_summary(df, settings):
     if df is None or df.empty: return "No data to analyze."
     summary = _header(f"Attachment/Reaction Analytics")
@@ -0,0 +1,93 @@
+# Authored by AI: Google's Gemini Model
+import numpy as np
+import pandas as pd
+
+AUTHOR_CODE_COLUMN = 'AuthorCode'  # int32 column of each row's author code, attached by index_authors
+
+def index_authors(df, names=None):
+    """Builds the AuthorIndex of a loaded frame and attaches every row's author code as its AuthorCode column."""
+    index, row_codes = AuthorIndex._build(df, names)
+    df[AUTHOR_CODE_COLUMN] = row_codes
+    return index
+
+class AuthorIndex:
+    """
+    Every AuthorID of a loaded export mapped to a dense integer code (its rank among the sorted IDs), with
+    per-author statistics held in NumPy arrays indexed by code: messages, words, attachments and the first and
+    last message time (datetime64, UTC for timezone-aware exports). `named` masks the authors that have a display
+    name, the ones the author list offers. Author selections are boolean masks over codes, so selecting rows or
+    summing statistics for a selection is a vectorized gather, not a list scan.
+    """
+    def __init__(self, ids, names, message_counts, word_counts, attachment_counts, first_times, last_times):
+        self.ids = np.asarray(ids, dtype=np.int64); self.names = list(names); self.named = np.array([name is not None for name in self.names], dtype=bool)
+        self.message_counts = np.asarray(message_counts, dtype=np.int64); self.word_counts = np.asarray(word_counts, dtype=np.int64)
+        self.attachment_counts = np.asarray(attachment_counts, dtype=np.int64)
+        self.first_times = np.asarray(first_times, dtype='datetime64[ns]'); self.last_times = np.asarray(last_times, dtype='datetime64[ns]')
+
+    def __len__(self): return len(self.ids)
+
+    @classmethod
+    def _build(cls, df, names=None):
+        """
+        Returns (index, per-row codes) from one pass over `df`. `names` maps AuthorID -> display name (by default
+        the first name seen for each ID); authors without a name get None. Rows without a valid AuthorID get code -1.
+        """
+        author_ids = df['AuthorID']; valid = author_ids.notna().to_numpy()
+        if valid.all(): valid = slice(None)  # the usual int64 column: whole-array views instead of masked copies
+        codes, ids = pd.factorize(author_ids.to_numpy(dtype='int64', na_value=0)[valid])
+        order = np.argsort(ids, kind='stable'); ranks = np.empty(len(ids), dtype=np.int64); ranks[order] = np.arange(len(ids))
+        codes = ranks[codes]; ids = ids[order]
+        dates = df['Date'] if df['Date'].dt.tz is None else df['Date'].dt.tz_convert('UTC').dt.tz_localize(None)
+        dates = dates.to_numpy(dtype='datetime64[ns]')[valid].view('int64')
+        words = df['WordCount'] if 'WordCount' in df.columns else df['Content'].astype(object).str.split().str.len().fillna(0)
+        attachments = df['HasAttachment'] if 'HasAttachment' in df.columns else df['Attachments'].notna() if 'Attachments' in df.columns else pd.Series(False, index=df.index)
+        first_times = np.full(len(ids), np.iinfo(np.int64).max); np.minimum.at(first_times, codes, dates)
+        last_times = np.full(len(ids), np.iinfo(np.int64).min); np.maximum.at(last_times, codes, dates)
+        if names is None: names = df.loc[valid, ['AuthorID', 'Author']].drop_duplicates(subset=['AuthorID']).set_index('AuthorID')['Author'].to_dict()
+        names = [names.get(author_id) for author_id in ids.tolist()]
+        index = cls(ids, [str(name) if pd.notna(name) else None for name in names], np.bincount(codes, minlength=len(ids)),
+                    np.bincount(codes, weights=words.to_numpy(dtype='int64')[valid], minlength=len(ids)).round(),
+                    np.bincount(codes, weights=attachments.to_numpy(dtype='int64')[valid], minlength=len(ids)).round(),
+                    first_times.view('datetime64[ns]'), last_times.view('datetime64[ns]'))
+        row_codes = np.full(len(df), -1, dtype=np.int32); row_codes[valid] = codes
+        return index, row_codes
+
+    def codes(self, author_ids):
+        """Codes for an array or Series of AuthorIDs; -1 for missing IDs and IDs not in the index."""
+        is_series = isinstance(author_ids, pd.Series)
+        known = author_ids.notna().to_numpy() if is_series else np.ones(len(author_ids), dtype=bool)
+        values = author_ids.to_numpy(dtype='int64', na_value=0) if is_series else np.asarray(author_ids, dtype=np.int64)
+        if not len(self.ids): return np.full(len(values), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.ids, values), len(self.ids) - 1)
+        return np.where(known & (self.ids[positions] == values), positions, -1)
+
+    def mask(self, author_ids=None):
+        """A boolean mask over codes selecting `author_ids` (every author when None)."""
+        if author_ids is None: return np.ones(len(self.ids), dtype=bool)
+        mask = np.zeros(len(self.ids), dtype=bool); codes = self.codes(list(author_ids)); mask[codes[codes >= 0]] = True
+        return mask
+
+    def row_mask(self, df, mask):
+        """
+        Per-row boolean mask of the rows of `df` whose author is selected in `mask`: a gather through the AuthorCode
+        column when `df` is (a slice of) the frame this index was built for, else a lookup of its AuthorIDs.
+        """
+        codes = df[AUTHOR_CODE_COLUMN].to_numpy() if AUTHOR_CODE_COLUMN in df.columns else self.codes(df['AuthorID'])
+        return np.append(mask, False)[codes]  # code -1 picks the trailing False
+
+    def selected_ids(self, mask): return self.ids[mask].tolist()
+
+    def author_data(self):
+        """The {'id', 'code', 'name', 'count'} list the author list and summaries show; authors without a name are left out."""
+        return [{"id": author_id, "code": code, "name": name, "count": count}
+                for code, (author_id, name, count) in enumerate(zip(self.ids.tolist(), self.names, self.message_counts.tolist())) if name is not None]
+
+    def to_dict(self):
+        """A JSON-serializable form (times as integer nanoseconds) for the parsed-data cache."""
+        return {'ids': self.ids.tolist(), 'names': self.names, 'message_counts': self.message_counts.tolist(), 'word_counts': self.word_counts.tolist(),
+                'attachment_counts': self.attachment_counts.tolist(), 'first_times': self.first_times.view('int64').tolist(), 'last_times': self.last_times.view('int64').tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['ids'], data['names'], data['message_counts'], data['word_counts'], data['attachment_counts'],
+                   np.asarray(data['first_times'], dtype=np.int64).view('datetime64[ns]'), np.asarray(data['last_times'], dtype=np.int64).view('datetime64[ns]'))
@@ -0,0 +1,105 @@
+# Authored by AI: Google's Gemini Model
+from utils.logger_setup import logger
+import hashlib
+import os
+import re
+import threading
+import time
+
+BAD_WORDS_PATH = os.path.join(os.path.dirname(__file__), '..', 'bad_words.txt')
+RELOAD_CHECK_INTERVAL = 2.0  # seconds between mtime checks of the word list
+
+_END = None  # trie key marking a complete word; never collides with a character
+
+def _is_word_char(char):
+    r"""The re module's \w for str patterns."""
+    return char.isalnum() or char == '_'
+
+def _lower_aligned(text):
+    """Lowercases text while keeping indices aligned with the original (a few characters expand when lowered)."""
+    lowered = text.lower()
+    if len(lowered) == len(text): return lowered
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+class BadWordMatcher:
+    r"""
+    Case-insensitive whole-word matcher over a trie of the word list.
+    Matches are only attempted at regex word boundaries and must end on one, mirroring r'\b(word1|word2|...)\b';
+    where two words match at the same position the longest one wins. Each text is scanned once.
+    """
+    def __init__(self, words):
+        self.words = sorted({word.strip().lower() for word in words if word.strip()})
+        self.fingerprint = hashlib.sha1('\n'.join(self.words).encode('utf-8')).hexdigest()  # stable across processes, unlike hash()
+        self._trie = {}
+        for word in self.words:
+            node = self._trie
+            for char in word: node = node.setdefault(char, {})
+            node[_END] = True
+        # Walks only start at boundaries followed by a character some word starts with, instead of at every boundary
+        self._starts = re.compile(r'\b(?=[' + ''.join(re.escape(char) for char in self._trie) + '])', re.IGNORECASE) if self._trie else None
+
+    def __len__(self): return len(self.words)
+
+    def _spans(self, text):
+        """Yields (start, end) spans of non-overlapping, leftmost-longest matches."""
+        if not text or self._starts is None: return
+        lowered = _lower_aligned(text); length = len(text); root = self._trie; position = 0
+        for boundary in self._starts.finditer(text):
+            start = boundary.start()
+            if start < position: continue
+            node = root; end = None; i = start
+            while i < length:
+                node = node.get(lowered[i])
+                if node is None: break
+                i += 1
+                # A word boundary follows the last matched character when the next one differs in being a \w character
+                if _END in node and _is_word_char(text[i - 1]) != (i < length and _is_word_char(text[i])): end = i
+            if end is not None:
+                yield start, end; position = end
+
+    def contains(self, text):
+        return next(self._spans(text), None) is not None
+
+    def count(self, text):
+        return sum(1 for _ in self._spans(text))
+
+    def find_all(self, text):
+        return [text[start:end] for start, end in self._spans(text)]
+
+    def sub(self, text, replacement, counter=None):
+        """Replaces every match with `replacement` in a single pass, counting the lowercased matches into `counter`."""
+        parts = []; position = 0
+        for start, end in self._spans(text):
+            parts.append(text[position:start]); parts.append(replacement); position = end
+            if counter is not None: counter[text[start:end].lower()] += 1
+        if not parts: return text
+        parts.append(text[position:])
+        return ''.join(parts)
+
+def load_matcher(path=BAD_WORDS_PATH):
+    with open(path, 'r', encoding='utf-8') as f: return BadWordMatcher(f)
+
+_matcher = BadWordMatcher([]); _matcher_mtime = -1.0; _last_check = None
+_matcher_lock = threading.Lock()
+
+def get_bad_words_matcher():
+    """Returns the current matcher, rebuilding it when bad_words.txt has changed on disk since the last load."""
+    global _matcher, _matcher_mtime, _last_check
+    now = time.monotonic()
+    if _last_check is not None and now - _last_check < RELOAD_CHECK_INTERVAL: return _matcher
+    with _matcher_lock:
+        _last_check = now
+        try: mtime = os.path.getmtime(BAD_WORDS_PATH)
+        except OSError: mtime = None
+        if mtime == _matcher_mtime: return _matcher
+        if mtime is None:
+            logger.warning("bad_words.txt not found. Bad word filter will not be available.")
+            _matcher = BadWordMatcher([]); _matcher_mtime = None
+        else:
+            try:
+                _matcher = load_matcher(); _matcher_mtime = mtime
+                logger.info(f"Loaded {len(_matcher)} words from bad_words.txt filter.")
+            except Exception as e: logger.error(f"Error loading bad_words.txt: {e}")
+    return _matcher
+
+get_bad_words_matcher()
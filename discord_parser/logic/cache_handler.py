@@ -0,0 +1,96 @@
+# Authored by AI: Google's Gemini Model
+from utils.logger_setup import logger
+import hashlib
+import json
+import os
+import time
+import pandas as pd
+from logic.author_index import AuthorIndex
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.discord_csv_parser', 'cache')
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+CACHE_VERSION = 4  # bump whenever load_csv_file changes the shape of what it returns
+HASH_SAMPLE_BYTES = 1024 ** 2
+
+def _fingerprint(filepath, variant=''):
+    """
+    Identifies a source file by path, size, mtime and a hash of its first, middle and last MiB.
+    Sampling keeps a cache lookup in the millisecond range even for multi-GB exports.
+    `variant` separates entries produced with different load options.
+    """
+    stat = os.stat(filepath); digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for offset in sorted({0, max(stat.st_size // 2 - HASH_SAMPLE_BYTES // 2, 0), max(stat.st_size - HASH_SAMPLE_BYTES, 0)}):
+            f.seek(offset); digest.update(f.read(HASH_SAMPLE_BYTES))
+    key_source = f"{CACHE_VERSION}|{variant}|{os.path.abspath(filepath)}|{stat.st_size}|{stat.st_mtime_ns}|{digest.hexdigest()}"
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:32]
+
+def _entry_paths(key):
+    return os.path.join(CACHE_DIR, f"{key}.pkl"), os.path.join(CACHE_DIR, f"{key}.json")
+
+def _list_entries():
+    """Returns [(last_access, total_bytes, key)] for every complete cache entry."""
+    entries = []
+    if not os.path.isdir(CACHE_DIR): return entries
+    for name in os.listdir(CACHE_DIR):
+        if not name.endswith('.json'): continue
+        key = name[:-5]; data_path, meta_path = _entry_paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f: last_access = json.load(f).get('last_access', 0)
+            entries.append((last_access, os.path.getsize(data_path) + os.path.getsize(meta_path), key))
+        except (OSError, ValueError): continue
+    return entries
+
+def _remove_entry(key):
+    for path in _entry_paths(key):
+        try: os.remove(path)
+        except FileNotFoundError: pass
+
+def _write_metadata(meta_path, metadata):
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f: json.dump(metadata, f)
+    os.replace(tmp_path, meta_path)
+
+def load_cached(filepath, variant=''):
+    """Returns the cached load_csv_file result for an unchanged file, or None on a miss."""
+    try:
+        key = _fingerprint(filepath, variant); data_path, meta_path = _entry_paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)): return None
+        with open(meta_path, 'r', encoding='utf-8') as f: metadata = json.load(f)
+        result = dict(metadata['result'], filepath=filepath, from_cache=True, dataframe=pd.read_pickle(data_path), author_index=AuthorIndex.from_dict(metadata['result']['author_index']))
+        metadata['last_access'] = time.time(); _write_metadata(meta_path, metadata)
+        logger.info(f"Loaded {os.path.basename(filepath)} from the parsed-data cache.")
+        return result
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache entry for {filepath}: {e}"); return None
+
+def store_cached(filepath, result, variant=''):
+    """Stores the typed DataFrame and precomputed statistics of a load_csv_file result, then enforces the size cap."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        key = _fingerprint(filepath, variant); data_path, meta_path = _entry_paths(key)
+        result['dataframe'].to_pickle(data_path + '.tmp'); os.replace(data_path + '.tmp', data_path)
+        metadata = {'source': os.path.abspath(filepath), 'created': time.time(), 'last_access': time.time(),
+                    'result': dict({k: v for k, v in result.items() if k not in ('dataframe', 'from_cache')}, author_index=result['author_index'].to_dict())}
+        _write_metadata(meta_path, metadata)
+        _enforce_size_cap()
+    except Exception as e:
+        logger.warning(f"Could not write cache entry for {filepath}: {e}")
+
+def _enforce_size_cap(max_bytes=None):
+    """Evicts least recently used entries until the cache fits within `max_bytes`."""
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = sorted(_list_entries()); total = sum(size for _, size, _ in entries)
+    while entries and total > max_bytes:
+        _, size, key = entries.pop(0); _remove_entry(key); total -= size
+        logger.info(f"Evicted cache entry {key} ({size / 1024 / 1024:.1f} MB).")
+
+def get_cache_size():
+    return sum(size for _, size, _ in _list_entries())
+
+def clear_cache():
+    """Deletes every cache entry. Returns (entries removed, bytes freed)."""
+    entries = _list_entries()
+    for _, _, key in entries: _remove_entry(key)
+    logger.info(f"Cleared {len(entries)} parsed-data cache entries.")
+    return len(entries), sum(size for _, size, _ in entries)
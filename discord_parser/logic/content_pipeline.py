@@ -0,0 +1,188 @@
+# Authored by AI: Google's Gemini Model
+import pandas as pd
+import re
+from collections import Counter
+from logic.bad_words import get_bad_words_matcher
+
+URL_PATTERN = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def find_urls(content):
+    """Distinct URLs in a Content Series, in order of first appearance, exactly as the URL formatter will see them."""
+    return list(content.dropna().astype(object).str.findall(URL_PATTERN).explode().dropna().unique())
+
+class ContentPipeline:
+    """
+    Content settings compiled once into the enabled processing stages.
+    `process` handles a single message and `process_many` a whole Content column; both return None for
+    messages removed by trimming. Snipped bad words are tallied in `snipped_words`.
+    """
+    def __init__(self, settings):
+        self.settings = settings
+        self.omit_brackets = bool(settings.get('omit_brackets'))
+        self.workers = int(settings.get('parallel_workers') or 1)
+        self.snipped_words = Counter()
+
+        author_format = settings.get('author_format'); self.scrub_targets = ()
+        if settings.get('scrub_author_from_content'):
+            if author_format == 'id_only': self.scrub_targets = ('name',)
+            elif author_format == 'name_only' or author_format == 'nickname': self.scrub_targets = ('id',)
+            elif author_format in ['numeric_keys', 'anonymize']: self.scrub_targets = ('name', 'id')
+
+        self.url_format = settings.get('url_format_mode', 'tag_generic') if settings.get('shorten_urls', False) else None
+        self.url_titles = {}  # url -> page title for the 'title' format, filled in by export_data before processing
+        self._bind()
+        filter_mode = settings.get('bad_word_filter_mode', 'disabled')
+        self.bad_word_mode = filter_mode if filter_mode != 'disabled' and self.matcher else None
+        self.snip_replacement = settings.get('snip_replacement', self.format_tag('snip'))
+        self.removed_tag = self.format_tag("message removed")
+        self.normalize_whitespace = bool(settings.get('normalize_whitespace', False))
+
+        self.trim_logic = settings.get('trim_logic', 'AND')
+        self.trim_bounds = [(key, settings[key]) for key in ['trim_chars_min', 'trim_chars_max', 'trim_words_min', 'trim_words_max'] if settings.get(f'{key}_enabled')]
+
+    @property
+    def transforms_content(self):
+        """
+        True when processing can change the text of a kept message. When False, trimming only depends on the
+        raw message, so precomputed features (see logic.features) can decide it without touching the text.
+        """
+        return bool(self.scrub_targets or self.url_format or self.bad_word_mode == 'snip_word' or self.normalize_whitespace)
+
+    def cache_key(self):
+        """Everything that affects the output of processing (but not, e.g., the worker count), for memoization."""
+        return (self.scrub_targets, self.url_format, self.omit_brackets, self.bad_word_mode, self.bad_word_mode and self.matcher.fingerprint,
+                self.snip_replacement, self.normalize_whitespace, self.trim_logic, tuple(self.trim_bounds))
+
+    def _bind(self):
+        self.matcher = get_bad_words_matcher()
+        self._url_replacement = {'blank': self._blank_url, 'tag_domain': self._domain_tag, 'title': self._title_tag}.get(self.url_format, self._generic_tag)
+
+    def __getstate__(self):
+        # The matcher is process-wide state; worker processes fetch their own copy instead of unpickling the trie.
+        state = self.__dict__.copy(); del state['matcher']; del state['_url_replacement']; state['snipped_words'] = Counter()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state); self._bind()
+
+    def format_tag(self, tag_name): return f"{tag_name}" if self.omit_brackets else f"<{tag_name}>"
+    def _blank_url(self, match): return ''
+    def _domain_tag(self, match): return self.format_tag(match.group(0).split('//')[-1].split('/')[0])
+    def _generic_tag(self, match):
+        url = match.group(0)
+        return self.format_tag('youtube') if 'youtube.com' in url or 'youtu.be' in url else self.format_tag('link')
+    def _title_tag(self, match):
+        title = self.url_titles.get(match.group(0))
+        return self.format_tag(title) if title else self._generic_tag(match)
+
+    def _trim_conditions(self, char_len, word_count):
+        values = {'trim_chars_min': char_len, 'trim_chars_max': char_len, 'trim_words_min': word_count, 'trim_words_max': word_count}
+        return [values[key] >= bound if key.endswith('_min') else values[key] <= bound for key, bound in self.trim_bounds]
+
+    def _keep(self, char_len, word_count):
+        conditions = self._trim_conditions(char_len, word_count)
+        if self.trim_logic == 'AND': return all(conditions)
+        if self.trim_logic == 'OR': return not conditions or any(conditions)
+        return True
+
+    def trim_mask(self, char_len, word_count):
+        """Boolean keep-mask over per-message character and word counts, following the AND/OR trim logic."""
+        keep = pd.Series(True, index=char_len.index); conditions = self._trim_conditions(char_len, word_count)
+        if self.trim_logic == 'AND':
+            for condition in conditions: keep &= condition
+        elif self.trim_logic == 'OR' and conditions:
+            keep = pd.concat(conditions, axis=1).any(axis=1)
+        return keep
+
+    def feature_masks(self, features):
+        """
+        (keep, snipped) masks computed from raw-content features alone; only valid when `transforms_content` is False.
+        Messages snipped by the bad-word filter are always kept, as in `process_many`.
+        """
+        snipped = features['BadWordHits'] > 0 if self.bad_word_mode == 'snip_message' else pd.Series(False, index=features.index)
+        return self.trim_mask(features['CharCount'], features['WordCount']) | snipped, snipped
+
+    def scrub(self, content, author_name, author_id):
+        """Scrubs author identifiers from the start of content."""
+        if not isinstance(content, str): return content
+        for target in self.scrub_targets:
+            item = str(author_name) if target == 'name' else str(author_id)
+            if item and content.startswith(f"{item}: "):
+                content = content[len(item) + 2:]
+        return content
+
+    def process(self, content, author_name=None, author_id=None):
+        if not isinstance(content, str): return None
+        if self.scrub_targets: content = self.scrub(content, author_name, author_id)
+        if self.url_format: content = URL_PATTERN.sub(self._url_replacement, content)
+        if self.bad_word_mode == 'snip_message':
+            if self.matcher.contains(content): return self.removed_tag
+        elif self.bad_word_mode == 'snip_word':
+            content = self.matcher.sub(content, self.snip_replacement, self.snipped_words)
+        if self.normalize_whitespace: content = WHITESPACE_PATTERN.sub(' ', content).strip()
+        return content if self._keep(len(content), len(content.split())) else None
+
+    def scrub_many(self, content, author_names, author_ids):
+        """Column-wise `scrub`: prefixes are compared in groups of equal length."""
+        for target in self.scrub_targets:
+            items = author_names if target == 'name' else author_ids
+            prefixes = items.astype(str).astype(object) + ': '; lengths = prefixes.str.len()
+            candidates = lengths > 2
+            for length in lengths[candidates].unique():
+                rows = candidates & (lengths == length)
+                hits = rows & (content.str.slice(0, length) == prefixes).fillna(False)
+                if hits.any(): content[hits] = content[hits].str.slice(length)
+        return content
+
+    def process_many(self, content, author_names=None, author_ids=None, progress_callback=None, features=None, cancel_token=None):
+        """
+        Column-at-a-time equivalent of `process` over a Content Series (author Series are only needed for scrubbing).
+        `features` are the precomputed raw-content features of the same rows; when given, rows without URLs or
+        bad words skip those stages and, if nothing rewrites the text, trimming uses the stored counts.
+        A `cancel_token` is checked before every stage.
+        Returns an object Series aligned with `content`, holding None for removed messages.
+        """
+        def report(percent, message):
+            if cancel_token is not None: cancel_token.raise_if_cancelled()
+            if progress_callback: progress_callback(percent, message)
+
+        is_text = content.notna() if isinstance(content.dtype, pd.StringDtype) else content.map(lambda c: isinstance(c, str))
+        text = content[is_text].astype(object); result = pd.Series(None, index=content.index, dtype=object)
+        if text.empty: return result
+        if features is not None: features = features[is_text]
+
+        if features is not None and not self.transforms_content:
+            report(55, "Applying trim rules...")
+            keep, snipped_messages = self.feature_masks(features)
+            text[snipped_messages] = self.removed_tag
+            result[keep[keep].index] = text[keep]
+            return result
+
+        if self.scrub_targets:
+            report(20, "Scrubbing authors from content...")
+            text = self.scrub_many(text, author_names[is_text], author_ids[is_text])
+        if self.url_format:
+            report(30, "Formatting URLs...")
+            # Scrubbing only removes a prefix, so it can never create a URL the raw-content feature missed
+            rows = features['HasURL'] if features is not None else pd.Series(True, index=text.index)
+            text[rows] = text[rows].str.replace(URL_PATTERN, self._url_replacement, regex=True)
+
+        # Bad-word hits were counted on the raw text, so they only apply while nothing has rewritten it yet
+        hits = features['BadWordHits'] > 0 if self.bad_word_mode and features is not None and not (self.scrub_targets or self.url_format) else pd.Series(True, index=text.index)
+        snipped_messages = pd.Series(False, index=text.index)
+        if self.bad_word_mode == 'snip_message':
+            report(40, "Filtering bad words...")
+            snipped_messages[hits] = text[hits].map(self.matcher.contains).astype(bool); text[snipped_messages] = self.removed_tag
+        elif self.bad_word_mode == 'snip_word':
+            report(40, "Filtering bad words...")
+            text[hits] = text[hits].map(lambda c: self.matcher.sub(c, self.snip_replacement, self.snipped_words))
+
+        if self.normalize_whitespace:
+            report(50, "Normalizing whitespace...")
+            text[~snipped_messages] = text[~snipped_messages].str.replace(WHITESPACE_PATTERN, ' ', regex=True).str.strip()
+
+        report(55, "Applying trim rules...")
+        keep = self.trim_mask(text.str.len(), text.str.split().str.len()) | snipped_messages
+        result[keep[keep].index] = text[keep]
+        return result
@@ -1,174 +1,239 @@
 # Authored by AI: Google's Gemini Model
 from utils.logger_setup import logger
+import numpy as np
 import pandas as pd
 import os
-import re
-from collections import Counter
-from utils.timing import Timer
-import requests
-from bs4 import BeautifulSoup
-
-BAD_WORDS_PATTERN = None
-try:
-    with open(os.path.join(os.path.dirname(__file__), '..', 'bad_words.txt'), 'r') as f:
-        bad_words = [line.strip().lower() for line in f if line.strip()]
-    if bad_words:
-        pattern = r'\b(' + '|'.join(re.escape(word) for word in bad_words) + r')\b'
-        BAD_WORDS_PATTERN = re.compile(pattern, re.IGNORECASE)
-        logger.info(f"Loaded and compiled {len(bad_words)} words from bad_words.txt filter.")
-except FileNotFoundError:
-    logger.warning("bad_words.txt not found. Bad word filter will not be available.")
-except Exception as e:
-    logger.error(f"Error loading bad_words.txt: {e}")
+from concurrent.futures import as_completed
+from utils.timing import MetricsRegistry, Timer
+from utils.executors import get_process_pool
+from logic.content_pipeline import ContentPipeline, find_urls
+from logic.features import FEATURE_COLUMNS, get_content_features
+from logic.file_handler import DATE_SORTED_ATTR
+from logic.export_writers import TEXT_TABLE_FORMATS, get_export_writer
+from logic.url_titles import URLTitleResolver
+from logic.author_index import AUTHOR_CODE_COLUMN
+
+def _date_bound(value, tz):
+    """Parses a filter date, interpreting naive dates in the timezone of the Date column."""
+    bound = pd.to_datetime(value)
+    if tz is None: return bound.tz_localize(None) if bound.tzinfo else bound
+    return bound.tz_localize(tz) if bound.tzinfo is None else bound.tz_convert(tz)
 
 def filter_dataframe_by_date(df, start_date_str, end_date_str):
+    """
+    Returns the messages from the start of the start date to the end of the end date. Frames sorted by
+    load_csv_file are located by binary search on Date and returned as a positional slice, without copying rows.
+    """
     with Timer(f"Filtering date range ('{start_date_str}' to '{end_date_str}')"):
         try:
-            start_date = pd.to_datetime(start_date_str); end_date = pd.to_datetime(end_date_str).replace(hour=23, minute=59, second=59)
-            if not pd.api.types.is_datetime64_any_dtype(df['Date']): df['Date'] = pd.to_datetime(df['Date'])
+            tz = df['Date'].dt.tz
+            start_date = _date_bound(start_date_str, tz); end_date = _date_bound(end_date_str, tz).replace(hour=23, minute=59, second=59)
+            if df.attrs.get(DATE_SORTED_ATTR):
+                start, end = df['Date'].searchsorted(start_date, side='left'), df['Date'].searchsorted(end_date, side='right')
+                return df.iloc[start:end]
             mask = (df['Date'] >= start_date) & (df['Date'] <= end_date)
             return df.loc[mask]
         except Exception as e:
             logger.error(f"Error during date filtering: {e}", exc_info=True); return df
 
-def _fetch_url_title(url):
+PARALLEL_MIN_ROWS = 20_000
+PARALLEL_SHARDS_PER_WORKER = 4
+
+def _process_content_shard(pipeline, shard, features=None):
+    """Process-pool entry point: formats one shard and returns it with its own snipped-word counts."""
+    return pipeline.process_many(shard['Content'], shard['Author'], shard['AuthorID'], features=features), pipeline.snipped_words
+
+def process_content(df, pipeline, progress_callback=None, cancel_token=None):
+    """
+    Formats the Content column of `df` with a ContentPipeline. When the pipeline has more than one worker the rows
+    are sharded across the shared process pool; shards are merged back in their original order and their snipped-word
+    counts are summed into `pipeline.snipped_words`. Precomputed content features are used when `df` has them.
+    A `cancel_token` is checked between stages and shards; queued shards are dropped once it is cancelled.
+    """
+    workers = pipeline.workers; features = get_content_features(df, pipeline.matcher, bool(pipeline.bad_word_mode))
+    if workers <= 1 or len(df) < PARALLEL_MIN_ROWS:
+        return pipeline.process_many(df['Content'], df['Author'], df['AuthorID'], progress_callback, features=features, cancel_token=cancel_token)
+
+    shard_size = -(-len(df) // (workers * PARALLEL_SHARDS_PER_WORKER))
+    columns = [col for col in ['AuthorID', 'Author', 'Content'] if col in df.columns]
+    starts = range(0, len(df), shard_size)
+    shards = [df.iloc[start:start + shard_size][columns] for start in starts]
+    shard_features = [None if features is None else features.iloc[start:start + shard_size] for start in starts]
+    logger.info(f"Processing content in {len(shards)} shards across {workers} worker processes.")
+    results = [None] * len(shards)
+    pool = get_process_pool(workers)
+    futures = {pool.submit(_process_content_shard, pipeline, shard, shard_features[i]): i for i, shard in enumerate(shards)}
+    for done, future in enumerate(as_completed(futures), start=1):
+        if cancel_token is not None and cancel_token.cancelled:
+            for pending in futures: pending.cancel()
+            cancel_token.raise_if_cancelled()
+        content, shard_counter = future.result()
+        results[futures[future]] = content; pipeline.snipped_words.update(shard_counter)
+        if progress_callback: progress_callback(15 + int(done / len(shards) * 45), f"Processing message content (shard {done}/{len(shards)})...")
+    return pd.concat(results)
+
+def _expand_for_export(df):
+    """Returns an export-ready copy: compact columns become plain objects and gaps become '' (missing Content stays NA)."""
+    expanded = df.copy()
+    for col in expanded.columns:
+        if col == 'Content': continue
+        dtype = expanded[col].dtype
+        if isinstance(dtype, (pd.SparseDtype, pd.CategoricalDtype)) or (pd.api.types.is_extension_array_dtype(dtype) and expanded[col].hasnans):
+            expanded[col] = expanded[col].astype(object)
+        if expanded[col].hasnans: expanded[col] = expanded[col].fillna('')
+    return expanded
+
+def _selected_rows(df, settings, author_index=None):
+    """Per-row mask of the selected authors' messages, or None when no selection is set and every row is exported."""
+    if not settings.get('selected_author_ids'): return None
+    if author_index is None: return df['AuthorID'].isin(settings['selected_author_ids']).to_numpy()
+    return author_index.row_mask(df, author_index.mask(settings['selected_author_ids']))
+
+def _resolve_url_titles(df, pipeline, progress_callback, selected_rows=None):
+    """Fetches the page titles of every distinct URL the export will contain, once, before any chunk is processed."""
+    rows = selected_rows.copy() if selected_rows is not None else np.ones(len(df), dtype=bool)
+    if 'HasURL' in df.columns: rows &= df['HasURL'].to_numpy()
+    urls = find_urls(df.loc[rows, 'Content'])
+    def report(done, total): progress_callback(5 + int(done / total * 10), f"Resolving link titles ({done:,}/{total:,})...")
+    resolver = URLTitleResolver()
     try:
-        response = requests.get(url, timeout=3, headers={'User-Agent': 'Mozilla/5.0'}); response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        title = soup.title.string.strip() if soup.title else None
-        return title.replace('\n', ' ').replace('\r', ' ')
-    except requests.RequestException: return None
-
-def _scrub_author_from_content(content, author_name, author_id, settings):
-    """Dynamically scrubs author identifiers from the start of content."""
-    author_format = settings.get('author_format')
-    to_remove = []
-    if author_format == 'id_only': to_remove.append(str(author_name))
-    elif author_format == 'name_only' or author_format == 'nickname': to_remove.append(str(author_id))
-    elif author_format in ['numeric_keys', 'anonymize']: to_remove.extend([str(author_name), str(author_id)])
-
-    for item in to_remove:
-        if item and content.startswith(f"{item}: "):
-            content = content[len(item) + 2:]
-    return content
-
-def _format_content(content, author_name, author_id, settings, snipped_words_counter):
-    if not isinstance(content, str) or content.lower() == 'nan': return None
-    
-    if settings.get('scrub_author_from_content'):
-        content = _scrub_author_from_content(content, author_name, author_id, settings)
-
-    def format_tag(tag_name): return f"{tag_name}" if settings.get('omit_brackets') else f"<{tag_name}>"
-    if settings.get('shorten_urls', False):
-        url_pattern = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+')
-        url_format = settings.get('url_format_mode', 'tag_generic')
-        if url_format == 'blank': content = url_pattern.sub('', content)
+        with Timer(f"Resolving titles for {len(urls):,} URLs"): pipeline.url_titles = resolver.resolve(urls, report)
+    finally: resolver.close()
+
+EXPORT_CHUNK_SIZE = 50_000
+SECOND_NS = 1_000_000_000
+DAY_NS = 86_400 * SECOND_NS
+
+class _ExportState:
+    """What column formatting must carry across chunks: the author key mapping and the last exported author."""
+    def __init__(self):
+        self.author_keys = {}; self.last_group_id = None; self.rows_written = 0
+
+def _format_columns(processed_df, settings, state):
+    """Applies author, date and attachment formatting to one chunk of processed rows."""
+    author_cols_to_process = [col for col in ['AuthorID', 'Author'] if col in processed_df.columns]
+    if settings['author_format'] == 'nickname' and settings.get('nicknames'): processed_df['Author'] = processed_df['AuthorID'].map(settings['nicknames'])
+    elif settings['author_format'] == 'anonymize' or settings['author_format'] == 'numeric_keys':
+        # Keys are handed out in order of first appearance, continuing the numbering of earlier chunks
+        for uid in processed_df['AuthorID'].unique():
+            if uid not in state.author_keys:
+                number = len(state.author_keys) + 1
+                state.author_keys[uid] = f"User{number}" if settings['author_format'] == 'anonymize' else number
+        new_col_name = 'Author' if settings['author_format'] == 'anonymize' else 'AuthorKey'
+        processed_df[new_col_name] = processed_df['AuthorID'].map(state.author_keys)
+        processed_df = processed_df.drop(columns=author_cols_to_process)
+    if settings['author_format'] not in ['both', 'nickname', 'numeric_keys', 'anonymize']:
+        if 'AuthorID' in processed_df.columns and settings['author_format'] in ['name', 'omit']: processed_df = processed_df.drop(columns=['AuthorID'])
+        if 'Author' in processed_df.columns and settings['author_format'] in ['id', 'omit']: processed_df = processed_df.drop(columns=['Author'])
+    if 'Date' in processed_df.columns:
+        if settings['date_format'] == 'hide': processed_df = processed_df.drop(columns=['Date'])
+        elif settings['date_format'] == 'relative_first': processed_df['Date'] = (processed_df['Date'] - settings['first_date_timestamp']).dt.total_seconds().astype(int)
+        elif settings['date_format'] == 'relative_last': processed_df['Date'] = (settings['last_date_timestamp'] - processed_df['Date']).dt.total_seconds().astype(int)
+        elif settings['date_format'] == 'unix': processed_df['Date'] = (processed_df['Date'] - pd.Timestamp("1970-01-01")) // pd.Timedelta('1s')
+    if 'Attachments' in processed_df.columns:
+        if not settings['include_attachments']: processed_df = processed_df.drop(columns=['Attachments'])
+        elif settings['attachment_format'] == 'binary': processed_df['Attachments'] = processed_df['Attachments'].apply(lambda x: '1' if x else '')
         else:
-            urls = url_pattern.findall(content)
-            for url in urls:
-                if url_format == 'tag_domain':
-                    try: replacement = format_tag(url.split('//')[-1].split('/')[0])
-                    except: replacement = format_tag('link')
-                else:
-                    if 'youtube.com' in url or 'youtu.be' in url: replacement = format_tag('youtube')
-                    else: replacement = format_tag('link')
-                content = content.replace(url, replacement, 1)
-
-    filter_mode = settings.get('bad_word_filter_mode', 'disabled')
-    if filter_mode != 'disabled' and BAD_WORDS_PATTERN:
-        matches = list(BAD_WORDS_PATTERN.finditer(content))
-        if matches:
-            if filter_mode == 'snip_message': return format_tag("message removed")
-            elif filter_mode == 'snip_word':
-                for match in matches: snipped_words_counter[match.group(0).lower()] += 1
-                replacement_text = settings.get('snip_replacement', format_tag('snip'))
-                content = BAD_WORDS_PATTERN.sub(replacement_text, content)
-
-    if settings.get('normalize_whitespace', False): content = re.sub(r'\s+', ' ', content).strip()
-    keep = True; char_len = len(content); word_count = len(content.split())
-    if settings['trim_logic'] == 'AND':
-        if settings['trim_chars_min_enabled'] and char_len < settings['trim_chars_min']: keep = False
-        if settings['trim_chars_max_enabled'] and char_len > settings['trim_chars_max']: keep = False
-        if settings['trim_words_min_enabled'] and word_count < settings['trim_words_min']: keep = False
-        if settings['trim_words_max_enabled'] and word_count > settings['trim_words_max']: keep = False
-    elif settings['trim_logic'] == 'OR':
-        conditions = []
-        if settings['trim_chars_min_enabled']: conditions.append(char_len >= settings['trim_chars_min'])
-        if settings['trim_chars_max_enabled']: conditions.append(char_len <= settings['trim_chars_max'])
-        if settings['trim_words_min_enabled']: conditions.append(word_count >= settings['trim_words_min'])
-        if settings['trim_words_max_enabled']: conditions.append(word_count <= settings['trim_words_max'])
-        if conditions and not any(conditions): keep = False
-    if not keep: return None
-    return content
-
-def export_data(df, settings, export_format, save_path, progress_callback):
+            tag = 'att.' if settings.get('omit_brackets') else '<att.>'
+            if settings['attachment_format'] == 'tag': processed_df['Attachments'] = processed_df['Attachments'].apply(lambda x: tag if x else '')
+            elif settings['attachment_format'] == 'filename': processed_df['Attachments'] = processed_df['Attachments'].apply(lambda x: os.path.basename(x.split('?')[0]) if x else '')
+    if 'Reactions' in processed_df.columns and not settings['include_reactions']: processed_df = processed_df.drop(columns=['Reactions'])
+    return processed_df
+
+def _naive_date_digits(dates):
+    """
+    How pandas' text formatting prints a naive datetime column: -1 when every value is midnight (dates only), else
+    the fraction-of-second digits (0, 3, 6 or 9) its finest value needs. pandas decides this per array, so an export
+    decides it once from the whole frame and formats every chunk the same way (see _format_naive_dates).
+    """
+    values = dates.dropna().to_numpy(dtype='datetime64[ns]').view('int64')
+    if not (values % DAY_NS).any(): return -1
+    fractions = values % SECOND_NS
+    return next(digits for digits, unit in ((0, SECOND_NS), (3, 1_000_000), (6, 1_000), (9, 1)) if not (fractions % unit).any())
+
+def _format_naive_dates(dates, digits, missing):
+    """Formats a naive datetime chunk with `digits` from _naive_date_digits; NaT becomes `missing`."""
+    if digits < 0: text = dates.dt.strftime('%Y-%m-%d')
+    else:
+        text = dates.dt.strftime('%Y-%m-%d %H:%M:%S.%f' if digits else '%Y-%m-%d %H:%M:%S')
+        if digits == 3: text = text.str[:-3]
+        elif digits == 9: text = text + dates.dt.nanosecond.fillna(0).astype(int).astype(str).str.zfill(3)
+    return text.fillna(missing)
+
+def _group_consecutive(processed_df, state):
+    """Blanks the author columns of messages that follow one from the same author, including across chunk boundaries."""
+    group_id_col = 'AuthorID'
+    if 'AuthorID' not in processed_df.columns and 'AuthorKey' in processed_df.columns: group_id_col = 'AuthorKey'
+    if group_id_col not in processed_df.columns or processed_df.empty: return processed_df
+    author_cols_to_group = [col for col in ['Author', 'AuthorID', 'AuthorKey'] if col in processed_df.columns]
+    for col in author_cols_to_group:
+        if processed_df[col].dtype != 'object': processed_df[col] = processed_df[col].astype('object')
+    group_ids = processed_df[group_id_col]; last_group_id = group_ids.iloc[-1]
+    mask = group_ids.notna() & (group_ids == group_ids.shift(fill_value=state.last_group_id))
+    processed_df.loc[mask, author_cols_to_group] = ''
+    state.last_group_id = last_group_id
+    return processed_df
+
+def _write_key_file(df, save_path, mapping):
+    key_path = os.path.join(os.path.dirname(save_path), 'export_key.txt')
+    original_authors = df.drop_duplicates(subset=['AuthorID']).set_index('AuthorID')['Author']
+    with open(key_path, 'w', encoding='utf-8') as f:
+        f.write("Export Key\n===================\n")
+        for uid, new_id in mapping.items(): f.write(f"{new_id}: {original_authors.get(uid, 'N/A')} ({uid})\n")
+
+def export_data(df, settings, export_format, save_path, progress_callback, chunk_size=EXPORT_CHUNK_SIZE, compression=None, compression_level=None, author_index=None):
+    """
+    Streams the export: rows are expanded, filtered, content-processed, formatted and written `chunk_size` at a
+    time, so peak memory follows the chunk size rather than the dataset. Author keys and consecutive-message
+    grouping carry over between chunks, giving the same output as formatting the whole frame at once.
+    With `compression` (see export_writers.COMPRESSION_CODECS) the chunks are compressed as they are written;
+    the result's `final_path` is the path actually written. The result's `metrics` is the MetricsRegistry of the
+    export's stages (settings['trace_memory'] adds tracemalloc peaks). The author selection is resolved to a row
+    mask once, by a gather through `author_index` (the load's AuthorIndex) when given.
+    """
     try:
-        with Timer("Total export process"):
-            progress_callback(5, "Preparing data..."); processed_df = df.copy(); processed_df.fillna('', inplace=True)
-            if settings.get('selected_author_ids'):
-                with Timer("Author filtering"): processed_df = processed_df[processed_df['AuthorID'].isin(settings['selected_author_ids'])]
-            snipped_words_counter = Counter()
-            with Timer("Content processing"):
-                total_rows = len(processed_df); processed_content = []
-                start_percent, end_percent = 15, 60
-                for i, row in enumerate(processed_df.itertuples()):
-                    processed_content.append(_format_content(row.Content, row.Author, row.AuthorID, settings, snipped_words_counter))
-                    if i % 250 == 0 or i == total_rows - 1:
-                        progress = start_percent + ((i + 1) / total_rows) * (end_percent - start_percent)
-                        progress_callback(int(progress), f"Processing message content ({i+1}/{total_rows})...")
-                processed_df['Content'] = processed_content
-                processed_df.dropna(subset=['Content'], inplace=True, ignore_index=True)
-            with Timer("Column formatting"):
-                progress_callback(75, "Formatting columns...")
-                def create_key_file(mapping):
-                    key_path = os.path.join(os.path.dirname(save_path), 'export_key.txt')
-                    original_authors = df.drop_duplicates(subset=['AuthorID']).set_index('AuthorID')['Author']
-                    with open(key_path, 'w', encoding='utf-8') as f:
-                        f.write("Export Key\n===================\n")
-                        for uid, new_id in mapping.items(): f.write(f"{new_id}: {original_authors.get(uid, 'N/A')} ({uid})\n")
-                author_cols_to_process = [col for col in ['AuthorID', 'Author'] if col in processed_df.columns]
-                if settings['author_format'] == 'nickname' and settings.get('nicknames'): processed_df['Author'] = processed_df['AuthorID'].map(settings['nicknames'])
-                elif settings['author_format'] == 'anonymize' or settings['author_format'] == 'numeric_keys':
-                    unique_ids = processed_df['AuthorID'].unique()
-                    if settings['author_format'] == 'anonymize': mapping = {uid: f"User{i+1}" for i, uid in enumerate(unique_ids)}
-                    else: mapping = {uid: i+1 for i, uid in enumerate(unique_ids)}
-                    if settings['create_key_file']: create_key_file(mapping)
-                    new_col_name = 'Author' if settings['author_format'] == 'anonymize' else 'AuthorKey'
-                    processed_df[new_col_name] = processed_df['AuthorID'].map(mapping)
-                    processed_df = processed_df.drop(columns=author_cols_to_process)
-                if settings['author_format'] not in ['both', 'nickname', 'numeric_keys', 'anonymize']:
-                    if 'AuthorID' in processed_df.columns and settings['author_format'] in ['name', 'omit']: processed_df = processed_df.drop(columns=['AuthorID'])
-                    if 'Author' in processed_df.columns and settings['author_format'] in ['id', 'omit']: processed_df = processed_df.drop(columns=['Author'])
-                if 'Date' in processed_df.columns:
-                    if settings['date_format'] == 'hide': processed_df = processed_df.drop(columns=['Date'])
-                    elif settings['date_format'] == 'relative_first': processed_df['Date'] = (processed_df['Date'] - settings['first_date_timestamp']).dt.total_seconds().astype(int)
-                    elif settings['date_format'] == 'relative_last': processed_df['Date'] = (settings['last_date_timestamp'] - processed_df['Date']).dt.total_seconds().astype(int)
-                    elif settings['date_format'] == 'unix': processed_df['Date'] = (processed_df['Date'] - pd.Timestamp("1970-01-01")) // pd.Timedelta('1s')
-                if 'Attachments' in processed_df.columns:
-                    if not settings['include_attachments']: processed_df = processed_df.drop(columns=['Attachments'])
-                    elif settings['attachment_format'] == 'binary': processed_df['Attachments'] = processed_df['Attachments'].apply(lambda x: '1' if x else '')
-                    else:
-                        tag = 'att.' if settings.get('omit_brackets') else '<att.>'
-                        if settings['attachment_format'] == 'tag': processed_df['Attachments'] = processed_df['Attachments'].apply(lambda x: tag if x else '')
-                        elif settings['attachment_format'] == 'filename': processed_df['Attachments'] = processed_df['Attachments'].apply(lambda x: os.path.basename(x.split('?')[0]) if x else '')
-                if 'Reactions' in processed_df.columns and not settings['include_reactions']: processed_df = processed_df.drop(columns=['Reactions'])
-            if settings.get('group_consecutive'):
-                with Timer("Grouping consecutive messages"):
-                    progress_callback(85, "Grouping consecutive messages...")
-                    group_id_col = 'AuthorID'
-                    if 'AuthorID' not in processed_df.columns and 'AuthorKey' in processed_df.columns: group_id_col = 'AuthorKey'
-                    if group_id_col in processed_df.columns:
-                        author_cols_to_group = [col for col in ['Author', 'AuthorID', 'AuthorKey'] if col in processed_df.columns]
-                        for col in author_cols_to_group:
-                            if processed_df[col].dtype != 'object': processed_df[col] = processed_df[col].astype('object')
-                        mask = processed_df[group_id_col].notna() & (processed_df[group_id_col] == processed_df[group_id_col].shift())
-                        processed_df.loc[mask, author_cols_to_group] = ''
-            with Timer(f"Writing {export_format.upper()} file"):
-                progress_callback(90, f"Writing {export_format.upper()} file...")
-                if export_format == 'csv': processed_df.to_csv(save_path, index=False, encoding='utf-8-sig', na_rep='')
-                elif export_format == 'txt':
-                    with open(save_path, 'w', encoding='utf-8') as f: f.write(processed_df.to_string(index=False, na_rep=''))
+        metrics = MetricsRegistry(trace_memory=bool(settings.get('trace_memory')))
+        with metrics, Timer("Total export process", rows=len(df)):
+            progress_callback(5, "Preparing data...")
+            pipeline = ContentPipeline(settings); state = _ExportState()
+            with Timer("Selecting authors", log=False): selected_rows = _selected_rows(df, settings, author_index)
+            if pipeline.url_format == 'title': _resolve_url_titles(df, pipeline, progress_callback, selected_rows)
+            writer_options = {
+                'txt': {'layout': settings.get('txt_layout', 'table'), 'column_widths': settings.get('txt_column_widths')},
+                'parquet': {'codec': settings.get('parquet_compression', 'snappy'), 'row_group_size': settings.get('parquet_row_group_size')},
+                'arrow': {'codec': settings.get('arrow_compression')},
+            }.get(export_format, {})
+            writer = get_export_writer(export_format, save_path, compression, compression_level, **writer_options)
+            # pandas picks a naive datetime column's print resolution per array, so text exports pick it once for the whole frame
+            date_digits = _naive_date_digits(df['Date']) if export_format in TEXT_TABLE_FORMATS and settings['date_format'] == 'show' and df['Date'].dt.tz is None and df['Date'].notna().any() else None
+            chunk_count = max(-(-len(df) // chunk_size), 1)
+            try:
+                for number, start in enumerate(range(0, max(len(df), 1), chunk_size), start=1):
+                    with Timer("Selecting rows", log=False) as timer:
+                        processed_df = _expand_for_export(df.iloc[start:start + chunk_size])
+                        if selected_rows is not None: processed_df = processed_df[selected_rows[start:start + chunk_size]]
+                        timer.rows = min(chunk_size, len(df) - start)
+                    progress_callback(15 + int((number - 1) / chunk_count * 75), f"Processing messages {start + 1:,}-{start + len(processed_df):,} of {len(df):,} (chunk {number}/{chunk_count})...")
+                    with Timer("Content processing", rows=len(processed_df), log=False):
+                        processed_df['Content'] = process_content(processed_df, pipeline)
+                    with Timer("Formatting columns", log=False) as timer:
+                        processed_df = processed_df.dropna(subset=['Content'], ignore_index=True).drop(columns=FEATURE_COLUMNS + [AUTHOR_CODE_COLUMN], errors='ignore')
+                        processed_df = _format_columns(processed_df, settings, state)
+                        if settings.get('group_consecutive'): processed_df = _group_consecutive(processed_df, state)
+                        if date_digits is not None and 'Date' in processed_df.columns:
+                            processed_df['Date'] = _format_naive_dates(processed_df['Date'], date_digits, 'NaT' if export_format == 'txt' else '')
+                        timer.rows = len(processed_df)
+                    with Timer(f"Writing {export_format.upper()} chunks", rows=len(processed_df), log=False):
+                        writer.write(processed_df); state.rows_written += len(processed_df)
+                    if compression and writer.sink.bytes_written: progress_callback(15 + int(number / chunk_count * 75), f"Compressed {writer.sink.bytes_written / 1024 / 1024:.2f} MB ({compression}, chunk {number}/{chunk_count})...")
+            finally:
+                progress_callback(90, f"Writing {export_format.upper()} file{f' ({compression})' if compression else ''}...")
+                with Timer(f"Finishing {export_format.upper()} file"): writer.close()
+            final_path = writer.sink.final_path
+            if settings.get('create_key_file') and settings['author_format'] in ['anonymize', 'numeric_keys']:
+                with Timer("Writing key file"): _write_key_file(df, save_path, state.author_keys)
             progress_callback(100, "Export complete.")
-        return {"success": True, "final_size": f"{os.path.getsize(save_path) / 1024:.2f} KB", "line_count": f"{len(processed_df.index):,}", "snipped_words": snipped_words_counter, "save_path": save_path}
+        final_size = f"{os.path.getsize(final_path) / 1024:.2f} KB" + (f" ({compression})" if compression else "")
+        return {"success": True, "final_size": final_size, "line_count": f"{state.rows_written:,}", "snipped_words": pipeline.snipped_words, "save_path": save_path, "final_path": final_path, "metrics": metrics}
     except Exception as e:
         logger.critical(f"Failed during export process: {e}", exc_info=True); return {"success": False, "error": str(e)}
\ No newline at end of file
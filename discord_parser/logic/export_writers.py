@@ -0,0 +1,247 @@
+# Authored by AI: Google's Gemini Model
+import bz2
+import gzip
+import io
+import lzma
+import os
+import tempfile
+import zipfile
+import pandas as pd
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# codec: (file extension, (lowest level, highest level), default level)
+COMPRESSION_CODECS = {
+    'zip': ('.zip', (0, 9), 6), 'gzip': ('.gz', (1, 9), 6), 'bz2': ('.bz2', (1, 9), 9),
+    'xz': ('.xz', (0, 9), 6), 'zstd': ('.zst', (1, 22), 3),
+}
+
+def available_codecs():
+    """Compression codecs usable in this environment; zstd needs the optional `zstandard` package."""
+    return [codec for codec in COMPRESSION_CODECS if codec != 'zstd' or zstandard is not None]
+
+def compressed_path(save_path, codec):
+    """Final output path: a zip replaces the extension (the export keeps its name inside), other codecs append theirs."""
+    if not codec: return save_path
+    if codec == 'zip': return os.path.splitext(save_path)[0] + '.zip'
+    return save_path + COMPRESSION_CODECS[codec][0]
+
+class ExportSink:
+    """
+    Binary destination of an export. With a codec, bytes are compressed as they are written, so the uncompressed
+    file never touches the disk. `level` is clamped to the codec's range; None uses the codec default.
+    """
+    def __init__(self, save_path, codec=None, level=None):
+        if codec and codec not in available_codecs(): raise ValueError(f"Compression codec not available: {codec}")
+        self.codec = codec or None; self.final_path = compressed_path(save_path, self.codec); self._closers = []
+        if self.codec:
+            _, (lowest, highest), default = COMPRESSION_CODECS[self.codec]
+            level = default if level is None else min(max(int(level), lowest), highest)
+        if self.codec == 'zip':
+            archive = zipfile.ZipFile(self.final_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=level)
+            self.stream = archive.open(os.path.basename(save_path), 'w', force_zip64=True)
+            self._raw = archive.fp; self._closers = [self.stream, archive]
+            return
+        self._raw = open(self.final_path, 'wb')
+        if self.codec == 'gzip': self.stream = gzip.GzipFile(filename=os.path.basename(save_path), mode='wb', fileobj=self._raw, compresslevel=level)
+        elif self.codec == 'bz2': self.stream = bz2.BZ2File(self._raw, 'wb', compresslevel=level)
+        elif self.codec == 'xz': self.stream = lzma.LZMAFile(self._raw, 'wb', preset=level)
+        elif self.codec == 'zstd': self.stream = zstandard.ZstdCompressor(level=level).stream_writer(self._raw, closefd=False)
+        else: self.stream = self._raw
+        self._closers = [self.stream, self._raw] if self.stream is not self._raw else [self._raw]
+
+    @property
+    def bytes_written(self):
+        """Bytes that have reached the output file so far (compressed size when a codec is used)."""
+        return self._raw.tell()
+
+    def text(self, encoding):
+        return io.TextIOWrapper(self.stream, encoding=encoding, newline='', write_through=True)
+
+    def close(self):
+        for closer in self._closers: closer.close()
+
+class CsvExportWriter:
+    """Appends formatted chunks to a CSV file; the header and the UTF-8 BOM are written with the first chunk only."""
+    def __init__(self, sink):
+        self.sink = sink; self._file = sink.text('utf-8-sig')
+        self._header_written = False
+
+    def write(self, chunk):
+        chunk.to_csv(self._file, index=False, header=not self._header_written, na_rep='')
+        self._header_written = True
+
+    def close(self):
+        self._file.flush(); self._file.detach(); self.sink.close()
+
+TXT_LAYOUTS = ['table', 'fixed', 'chat']
+TXT_FIXED_WIDTHS = {'AuthorID': 20, 'AuthorKey': 9, 'Author': 20, 'Date': 25, 'Content': 80, 'Attachments': 12, 'Reactions': 12}
+TXT_BLOCK_ROWS = 10_000  # rows joined per write when the spooled table is laid out
+_ESCAPES = str.maketrans({'\t': '\\t', '\n': '\\n', '\r': '\\r'})  # as DataFrame.to_string prints them
+
+def _format_cells(column):
+    """String cells of one column, rendered the way DataFrame.to_string(na_rep='') renders the export's columns."""
+    if pd.api.types.is_datetime64_any_dtype(column): return column.astype(str).fillna('NaT')
+    na_rep = '<NA>' if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) and column.dtype.kind in 'iufb' else ''
+    cells = column.astype(object).where(column.notna(), na_rep).astype(str)
+    return cells.str.translate(_ESCAPES) if column.dtype.kind in 'OSUT' or pd.api.types.is_string_dtype(column) else cells
+
+class TxtExportWriter:
+    """
+    Text export in one of TXT_LAYOUTS, written without ever holding the whole table in memory.
+      table: the right-aligned layout of DataFrame.to_string. Column widths depend on every row, so rendered
+             rows are spooled to a temporary file while the widths are measured, then padded in blocks on close.
+      fixed: the same layout with widths from `column_widths` (falling back to TXT_FIXED_WIDTHS), written as it
+             arrives; longer cells are written in full.
+      chat:  one "[date] author: content" line per message, followed by any attachment and reaction text.
+    """
+    def __init__(self, sink, layout='table', column_widths=None):
+        if layout not in TXT_LAYOUTS: raise ValueError(f"Unsupported TXT layout: {layout}")
+        self.sink = sink; self.layout = layout; self._file = sink.text('utf-8')
+        self._widths = {**TXT_FIXED_WIDTHS, **(column_widths or {})} if layout == 'fixed' else {}
+        self._columns = None; self._rows = 0; self._spool = None
+
+    def write(self, chunk):
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+            if self.layout == 'table': self._spool = tempfile.TemporaryFile('w+', encoding='utf-8', newline='\n')
+            elif self.layout == 'fixed':
+                self._widths = {col: self._widths.get(col, len(str(col))) for col in self._columns}
+                self._file.write(self._pad(str(col) for col in self._columns))
+        if chunk.empty: return
+        cells = {col: _format_cells(chunk[col]) for col in self._columns}
+        if self.layout == 'chat': self._file.write(self._chat_lines(cells)); return
+        # Escaped cells hold no tabs or newlines, so spooled rows can be tab-separated and read back line by line
+        if self.layout == 'fixed':
+            first, *rest = [cells[col].str.rjust(self._widths[col]) for col in self._columns]
+            self._file.write('\n' + '\n'.join(first.str.cat(rest, sep=' ') if rest else first))
+        else:
+            for col in self._columns: self._widths[col] = max(self._widths.get(col, len(str(col))), int(cells[col].str.len().max()))
+            first, *rest = cells.values()
+            self._spool.write('\n'.join(first.str.cat(rest, sep='\t') if rest else first) + '\n')
+        self._rows += len(chunk)
+
+    def _pad(self, cells):
+        return ' '.join(cell.rjust(self._widths[col]) for col, cell in zip(self._columns, cells))
+
+    def _chat_lines(self, cells):
+        author_col = next((col for col in ['Author', 'AuthorKey', 'AuthorID'] if col in cells), None)
+        line = ('[' + cells['Date'] + '] ') if 'Date' in cells else pd.Series('', index=cells['Content'].index)
+        if author_col:  # messages grouped under the previous author have a blank author cell and show no name
+            author = cells[author_col]; line = line + author.where(author == '', author + ': ')
+        line = line + cells['Content']
+        for col in ['Attachments', 'Reactions']:
+            if col in cells: line = line + cells[col].where(cells[col] == '', ' ' + cells[col])
+        return '\n'.join(line) + '\n'
+
+    def _write_table(self):
+        if not self._rows:  # keep DataFrame.to_string's "Empty DataFrame" text for exports without rows
+            self._file.write(pd.DataFrame(columns=self._columns or []).to_string(index=False)); return
+        self._file.write(self._pad(str(col) for col in self._columns))
+        self._spool.seek(0); block = []
+        for row in self._spool:
+            block.append(self._pad(row[:-1].split('\t')))
+            if len(block) == TXT_BLOCK_ROWS: self._file.write('\n' + '\n'.join(block)); block = []
+        if block: self._file.write('\n' + '\n'.join(block))
+
+    def close(self):
+        try:
+            if self.layout == 'table': self._write_table()
+            self._file.flush(); self._file.detach(); self.sink.close()
+        finally:
+            if self._spool is not None: self._spool.close(); self._spool = None
+
+def _integer_columns(chunk):
+    """Object columns holding integers and '' blanks, e.g. author IDs blanked by consecutive-message grouping."""
+    columns = []
+    for col in chunk.columns:
+        if chunk[col].dtype != object: continue
+        values = chunk[col][chunk[col] != ''].dropna()
+        if len(values) and pd.api.types.infer_dtype(values) == 'integer': columns.append(col)
+    return columns
+
+def _typed_chunk(chunk, integer_columns):
+    """Typed formats keep IDs as integers, so the '' blanks of `integer_columns` become nulls."""
+    if not integer_columns: return chunk
+    chunk = chunk.copy(deep=False)
+    for col in integer_columns: chunk[col] = chunk[col].mask(chunk[col] == '').astype('Int64')
+    return chunk
+
+class JsonlExportWriter:
+    """JSON Lines: one object per message, with ISO dates and integer IDs (detected on the first chunk with rows)."""
+    def __init__(self, sink):
+        self.sink = sink; self._file = sink.text('utf-8'); self._integer_columns = None
+
+    def write(self, chunk):
+        if chunk.empty: return
+        if self._integer_columns is None: self._integer_columns = _integer_columns(chunk)
+        _typed_chunk(chunk, self._integer_columns).to_json(self._file, orient='records', lines=True, date_format='iso', date_unit='s', force_ascii=False)
+
+    def close(self):
+        self._file.flush(); self._file.detach(); self.sink.close()
+
+class _ArrowExportWriter:
+    """
+    Base for the pyarrow formats: the schema is fixed by the first chunk with rows (a selection or trim can empty
+    leading chunks, whose object columns would infer as null) and later chunks are converted to it. Columns still
+    all-null in that chunk are typed as strings. An export without any rows gets the schema of its last empty chunk.
+    """
+    def __init__(self, sink):
+        self.sink = sink; self._schema = None; self._integer_columns = None; self._writer = None; self._empty_chunk = None
+
+    def write(self, chunk):
+        if chunk.empty and self._writer is None:
+            self._empty_chunk = chunk; return
+        if self._integer_columns is None: self._integer_columns = _integer_columns(chunk)
+        table = pa.Table.from_pandas(_typed_chunk(chunk, self._integer_columns), schema=self._schema, preserve_index=False).replace_schema_metadata(None)
+        if self._writer is None:
+            self._schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema])
+            table = table.cast(self._schema); self._writer = self._open(self._schema)
+        if table.num_rows: self._write(table)
+
+    def close(self):
+        try:
+            if self._writer is None and self._empty_chunk is not None: self._writer = self._open(pa.Table.from_pandas(self._empty_chunk, preserve_index=False).schema.remove_metadata())
+            if self._writer is not None: self._writer.close()
+        finally: self.sink.close()
+
+class ParquetExportWriter(_ArrowExportWriter):
+    """
+    Parquet, with `codec` any compression pyarrow supports ('snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none').
+    Each export chunk is written as row groups of at most `row_group_size` rows; groups never span chunks.
+    """
+    def __init__(self, sink, codec='snappy', row_group_size=None):
+        super().__init__(sink); self.codec = codec; self.row_group_size = row_group_size
+
+    def _open(self, schema): return pq.ParquetWriter(self.sink.stream, schema, compression=self.codec)
+    def _write(self, table): self._writer.write_table(table, row_group_size=self.row_group_size)
+
+class ArrowExportWriter(_ArrowExportWriter):
+    """Arrow IPC file format (Feather v2), one record batch per export chunk; `codec` is None, 'lz4' or 'zstd'."""
+    def __init__(self, sink, codec=None):
+        super().__init__(sink); self.codec = codec
+
+    def _open(self, schema): return pa.ipc.new_file(self.sink.stream, schema, options=pa.ipc.IpcWriteOptions(compression=self.codec))
+    def _write(self, table): self._writer.write_table(table)
+
+EXPORT_WRITERS = {'csv': CsvExportWriter, 'txt': TxtExportWriter, 'jsonl': JsonlExportWriter, 'parquet': ParquetExportWriter, 'arrow': ArrowExportWriter}
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+TEXT_TABLE_FORMATS = ('csv', 'txt')  # rendered by pandas' text formatting, which drops the time of all-midnight datetime columns
+
+def available_formats():
+    """Export formats usable in this environment; Parquet and Arrow need the optional `pyarrow` package."""
+    return [fmt for fmt in EXPORT_WRITERS if pa is not None or fmt not in COLUMNAR_FORMATS]
+
+def get_export_writer(export_format, save_path, compression=None, compression_level=None, **options):
+    """`options` go to the writer's constructor, e.g. layout/column_widths for TXT or row_group_size for Parquet."""
+    if export_format not in EXPORT_WRITERS: raise ValueError(f"Unsupported export format: {export_format}")
+    if export_format not in available_formats(): raise ImportError("Parquet and Arrow exports need the optional `pyarrow` package.")
+    if compression and export_format in COLUMNAR_FORMATS: raise ValueError("Parquet and Arrow files are compressed internally; export them without a compression codec.")
+    return EXPORT_WRITERS[export_format](ExportSink(save_path, compression, compression_level), **options)
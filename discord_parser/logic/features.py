@@ -0,0 +1,59 @@
+# Authored by AI: Google's Gemini Model
+import threading
+import weakref
+import pandas as pd
+from logic.content_pipeline import URL_PATTERN
+
+LOAD_FEATURE_COLUMNS = ['CharCount', 'WordCount', 'HasURL', 'HasAttachment']  # vectorized, attached at load
+FEATURE_COLUMNS = LOAD_FEATURE_COLUMNS + ['BadWordHits']  # BadWordHits is counted lazily, see get_content_features
+
+_bad_word_hits_cache = {}  # id(frame) -> (matcher fingerprint, BadWordHits Series); dropped when the frame is garbage collected
+_bad_word_hits_lock = threading.Lock()
+
+def _bad_word_hits(content, matcher):
+    text = content.dropna().astype(object)
+    hits = pd.Series(0, index=content.index, dtype='int32')
+    if len(matcher) and not text.empty: hits[text.index] = text.map(matcher.count).astype('int32')
+    return hits
+
+def add_content_features(df):
+    """
+    Attaches per-message features of the raw Content as compact columns: character and word counts (int32) and
+    URL and attachment presence (bool). Missing content counts as empty. Bad-word hits need the (pure-Python)
+    matcher on every message, so they are left to get_content_features until a bad-word mode asks for them.
+    """
+    text = df['Content'].astype(object)
+    df['CharCount'] = text.str.len().fillna(0).astype('int32')
+    df['WordCount'] = text.str.split().str.len().fillna(0).astype('int32')
+    df['HasURL'] = text.str.contains(URL_PATTERN).fillna(False).astype(bool)
+    df['HasAttachment'] = df['Attachments'].notna().to_numpy() if 'Attachments' in df.columns else False
+    return df
+
+def has_features(df):
+    return all(col in df.columns for col in LOAD_FEATURE_COLUMNS)
+
+def _cached_bad_word_hits(df, matcher):
+    """
+    BadWordHits of `df`, counted the first time it is needed and again when bad_words.txt has changed since.
+    The loaded frame is shared by the interactive and bulk lanes, so the counts are kept beside it rather than
+    assigned into it, and counted under a lock so two lanes never count the same frame at once.
+    """
+    key = id(df)
+    with _bad_word_hits_lock:
+        fingerprint, hits = _bad_word_hits_cache.get(key, (None, None))
+        if hits is None or fingerprint != matcher.fingerprint:
+            if fingerprint is None: weakref.finalize(df, _bad_word_hits_cache.pop, key, None)
+            hits = _bad_word_hits(df['Content'], matcher); _bad_word_hits_cache[key] = (matcher.fingerprint, hits)
+    return hits
+
+def get_content_features(df, matcher, bad_words=False):
+    """
+    Returns the feature columns of `df` as a new frame, or None when it was loaded without them. With `bad_words`,
+    BadWordHits is included (see _cached_bad_word_hits); `df` itself is never modified.
+    """
+    if not has_features(df): return None
+    if not bad_words: return df[LOAD_FEATURE_COLUMNS]
+    return df[LOAD_FEATURE_COLUMNS].assign(BadWordHits=_cached_bad_word_hits(df, matcher))
+
+def clear_bad_word_hits():
+    with _bad_word_hits_lock: _bad_word_hits_cache.clear()
@@ -3,70 +3,181 @@ from utils.logger_setup import logger
 import os
 import pandas as pd
 import re
+from pandas.api.types import union_categoricals
+from logic.cache_handler import load_cached, store_cached
+from logic.word_stats import make_word_counter
+from logic.features import add_content_features
+from logic.author_index import index_authors
+try:
+    import pyarrow  # noqa: F401
+    CONTENT_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    CONTENT_DTYPE = pd.StringDtype()
 
-def load_csv_file(filepath):
+DEFAULT_CHUNK_SIZE = 100_000
+SPARSE_DENSITY_THRESHOLD = 0.5
+DATE_SORTED_ATTR = 'sorted_by_date'  # df.attrs flag: rows are in ascending Date order
+
+def _column_nbytes(series):
+    """Returns the deep memory footprint of a column, including sparse object columns."""
+    if isinstance(series.dtype, pd.SparseDtype):
+        return int(pd.Series(series.array.sp_values).memory_usage(deep=True, index=False) + series.array.sp_index.indices.nbytes)
+    return int(series.memory_usage(deep=True, index=False))
+
+def get_memory_report(df):
+    """Returns a {column: bytes} mapping for the DataFrame, with the index under 'Index'."""
+    report = {'Index': int(df.index.memory_usage(deep=True))}
+    report.update({col: _column_nbytes(df[col]) for col in df.columns})
+    return report
+
+def compact_dataframe(df):
+    """
+    Converts a loaded export to a compact columnar layout: categorical authors, int64 snowflake IDs,
+    nullable (Arrow-backed when available) content and sparse attachment/reaction columns.
+    """
+    author_ids = pd.to_numeric(df['AuthorID'], errors='coerce', dtype_backend='numpy_nullable')
+    df['AuthorID'] = author_ids.astype('int64') if author_ids.notna().all() else author_ids
+    df['Author'] = df['Author'].astype('category')
+    if df['Content'].dtype != CONTENT_DTYPE: df['Content'] = df['Content'].astype(CONTENT_DTYPE)
+    for col in ['Attachments', 'Reactions']:
+        if col not in df.columns: continue
+        if df[col].notna().mean() < SPARSE_DENSITY_THRESHOLD: df[col] = df[col].astype(pd.SparseDtype(object, float('nan')))
+        else: df[col] = df[col].astype(CONTENT_DTYPE)
+    return df
+
+def _concat_compacted(chunks):
+    """
+    Concatenates chunks that were compacted one by one, so the whole file never exists as object columns: the
+    Author categoricals are unioned, and each Attachments/Reactions chunk is brought to the layout compact_dataframe
+    would have chosen for the whole file (sparse below SPARSE_DENSITY_THRESHOLD overall, dense otherwise).
+    """
+    if len(chunks) == 1: return chunks[0]
+    total = sum(len(chunk) for chunk in chunks)
+    for col in ['Attachments', 'Reactions']:
+        if col not in chunks[0].columns: continue
+        sparse = sum(int(chunk[col].count()) for chunk in chunks) / total < SPARSE_DENSITY_THRESHOLD
+        for chunk in chunks:
+            if isinstance(chunk[col].dtype, pd.SparseDtype) == sparse: continue
+            chunk[col] = chunk[col].astype(object).astype(pd.SparseDtype(object, float('nan'))) if sparse else chunk[col].sparse.to_dense().astype(CONTENT_DTYPE)
+    # Column by column, releasing each column's chunks as it is joined, so at most one column exists twice
+    columns = {}
+    for col in list(chunks[0].columns):
+        pieces = [chunk.pop(col) for chunk in chunks]
+        columns[col] = union_categoricals(pieces, sort_categories=True) if col == 'Author' else pd.concat(pieces, ignore_index=True)
+        del pieces
+    return pd.DataFrame(columns, copy=False)
+
+def sort_by_date(df):
+    """
+    Stable-sorts rows by Date so date ranges can be located by binary search. The index keeps each row's
+    original position in the file, so the file order remains recoverable with sort_index().
+    """
+    if not df['Date'].is_monotonic_increasing: df = df.sort_values('Date', kind='stable')
+    df.attrs[DATE_SORTED_ATTR] = True
+    return df
+
+def _iter_csv_chunks(filepath, chunk_size, progress_callback=None):
+    """Yields DataFrame chunks of the CSV, reporting progress by bytes consumed."""
+    file_size = os.path.getsize(filepath) or 1
+    with open(filepath, 'rb') as f:
+        # Snowflake IDs are read as text so they never round-trip through float64 and lose precision
+        read_kwargs = {'on_bad_lines': 'warn', 'dtype': {'AuthorID': str}}
+        reader = pd.read_csv(f, chunksize=chunk_size, **read_kwargs) if chunk_size else [pd.read_csv(f, **read_kwargs)]
+        for chunk in reader:
+            if progress_callback:
+                progress_callback(int(min(f.tell() / file_size, 1.0) * 90), f"Reading CSV ({f.tell() / 1024 / 1024:.1f}/{file_size / 1024 / 1024:.1f} MB)...")
+            yield chunk
+
+def load_csv_file(filepath, progress_callback=None, chunk_size=DEFAULT_CHUNK_SIZE, use_cache=True, word_stats='exact'):
     """
     Loads and performs detailed analysis of a CSV file.
+    The file is streamed in chunks of `chunk_size` rows (None reads it in one go) and all
+    statistics are accumulated per chunk, so temporary memory is bounded by the chunk size.
+    With `use_cache`, an unchanged file is served from the parsed-data cache instead of being re-parsed.
+    Rows are stable-sorted by Date (see sort_by_date) and per-message content features (see logic.features) are attached as extra columns.
+    `word_stats` selects exact unique-word counting or a constant-memory approximate (HyperLogLog) estimate.
     Returns a dictionary of file metadata or None on failure.
     """
     logger.info(f"Begin loading and detailed analysis of file: {filepath}")
     if not filepath or not os.path.exists(filepath):
         logger.error(f"File path is invalid or does not exist: {filepath}")
         return None
-    
-    try:
-        df = pd.read_csv(filepath, on_bad_lines='warn')
-        logger.info("CSV file read into DataFrame successfully.")
 
+    if use_cache:
+        if progress_callback: progress_callback(0, "Checking parsed-data cache...")
+        cached = load_cached(filepath, variant=word_stats)
+        if cached:
+            if progress_callback: progress_callback(100, "File loaded from cache.")
+            return cached
+
+    try:
         required_columns = ['AuthorID', 'Author', 'Date', 'Content']
-        if not all(col in df.columns for col in required_columns):
-            logger.error(f"CSV is missing one of the required columns: {required_columns}")
+        chunks = []; author_names = {}
+        word_counter = make_word_counter(word_stats); first_date = last_date = None
+
+        for chunk in _iter_csv_chunks(filepath, chunk_size, progress_callback):
+            if not all(col in chunk.columns for col in required_columns):
+                logger.error(f"CSV is missing one of the required columns: {required_columns}")
+                return None
+
+            # --- Perform Analysis (per chunk) ---
+            chunk['AuthorID'] = pd.to_numeric(chunk['AuthorID'], errors='coerce', dtype_backend='numpy_nullable')
+            chunk['Content'] = chunk['Content'].astype(CONTENT_DTYPE)
+            chunk['Date'] = pd.to_datetime(chunk['Date'])
+            if chunk.empty: continue
+
+            # Word counts are streamed chunk by chunk; unique words are tracked as hashes, never as strings
+            word_counter.update(chunk['Content'])
+            # Per-message features are computed once here so trimming and analytics never re-scan the text
+            add_content_features(chunk)
+
+            chunk_first, chunk_last = chunk['Date'].min(), chunk['Date'].max()
+            first_date = chunk_first if first_date is None or chunk_first < first_date else first_date
+            last_date = chunk_last if last_date is None or chunk_last > last_date else last_date
+
+            for author_id, author_name in chunk[['AuthorID', 'Author']].drop_duplicates(subset=['AuthorID']).itertuples(index=False):
+                author_names.setdefault(author_id, author_name)
+            chunks.append(compact_dataframe(chunk))
+        if not chunks:
+            logger.error(f"CSV contains no messages: {filepath}")
             return None
+        logger.info("CSV file read into DataFrame successfully.")
 
-        # --- Perform Analysis ---
-        df['Content'] = df['Content'].astype(str)
-        df['Date'] = pd.to_datetime(df['Date'])
-        
+        if progress_callback: progress_callback(95, "Finalizing file analysis...")
+        df = _concat_compacted(chunks); chunks.clear()
+        df = sort_by_date(df)
+        memory_report = get_memory_report(df)
+        logger.info(f"DataFrame compacted to {sum(memory_report.values()) / 1024 / 1024:.2f} MB in memory.")
         file_size = os.path.getsize(filepath)
         total_messages = len(df)
-        
-        # Word counts (can be slow on very large files)
-        all_words = df['Content'].str.cat(sep=' ').split()
-        total_words = len(all_words)
-        unique_words = len(set(word.lower() for word in all_words))
-
-        first_date = df['Date'].min()
-        last_date = df['Date'].max()
         date_range_days = (last_date - first_date).days
 
-        # Author analysis
-        author_msg_counts = df['AuthorID'].value_counts().to_dict()
-        unique_authors_df = df[['AuthorID', 'Author']].drop_duplicates(subset=['AuthorID']).dropna()
-        
-        author_data = [
-            {
-                "id": row['AuthorID'],
-                "name": row['Author'],
-                "count": author_msg_counts.get(row['AuthorID'], 0)
-            }
-            for index, row in unique_authors_df.iterrows()
-        ]
+        # Author analysis: dense codes and per-author statistics, built in one grouped pass
+        author_index = index_authors(df, author_names)
+        author_data = author_index.author_data()
         total_authors = len(author_data)
 
         logger.info("Detailed file analysis complete.")
-        return {
+        result = {
             "filepath": filepath,
             "dataframe": df,
             "size": f"{file_size / 1024:.2f} KB",
             "total_messages": f"{total_messages:,}",
             "total_authors": f"{total_authors:,}",
-            "total_words": f"{total_words:,}",
-            "unique_words": f"{unique_words:,}",
+            "total_words": f"{word_counter.total:,}",
+            "unique_words": f"{word_counter.unique:,}" if word_stats == 'exact' else f"~{word_counter.unique:,}",
             "first_date": first_date.strftime('%Y-%m-%d %H:%M:%S'),
             "last_date": last_date.strftime('%Y-%m-%d %H:%M:%S'),
             "date_range_days": f"{date_range_days} days",
             "authors": author_data,
+            "author_index": author_index,
+            "memory_usage": memory_report,
         }
+        if use_cache:
+            if progress_callback: progress_callback(98, "Writing parsed-data cache...")
+            store_cached(filepath, result, variant=word_stats)
+        if progress_callback: progress_callback(100, "File loaded.")
+        return result
     except Exception as e:
         logger.critical(f"An unexpected error occurred while processing {filepath}: {e}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
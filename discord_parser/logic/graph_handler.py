@@ -1,49 +1,82 @@
 # Authored by AI: Google's Gemini Model
 from utils.logger_setup import logger
+import numpy as np
 import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
 from matplotlib.figure import Figure
-from matplotlib.ticker import MaxNLocator
+from logic.rollups import get_rollups
 
-def create_frequency_graph(df, scale):
-    """Generates a message frequency graph from the DataFrame."""
-    logger.info(f"Generating message frequency graph with scale: {scale}")
+FREQ_MAP = {'hour': 'h', 'day': 'D', 'week': 'W-MON', 'month': 'ME'}
+BUCKET_DAYS = {'hour': 1 / 24, 'day': 1, 'week': 7, 'month': 30}
+MAX_BARS = 400  # above this many buckets the series is drawn as a single step line
+MIN_LOD_POINTS = 1000
+
+def get_frequency_series(df, scale):
+    """Returns (message counts per bucket, scale) for the graph; this is the only part that touches the data."""
     if df is None or df.empty:
-        logger.warning("DataFrame is empty, cannot generate graph."); return None
+        logger.warning("DataFrame is empty, graph will be blank."); return pd.Series(dtype='int64', index=pd.DatetimeIndex([])), scale.lower()
+    return get_rollups(df).series(FREQ_MAP.get(scale.lower(), 'D')), scale.lower()
+
+def downsample_minmax(x, y, max_points):
+    """Min/max decimation: keeps the lowest and highest point of each bin, in order, so spikes survive."""
+    if len(y) <= max_points: return x, y
+    bin_size = -(-len(y) // (max_points // 2))
+    padded = np.pad(y, (0, (-len(y)) % bin_size), mode='edge').reshape(-1, bin_size)
+    offsets = np.arange(len(padded)) * bin_size
+    index = np.sort(np.stack([offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)], axis=1), axis=1).ravel()
+    index = np.minimum(index, len(y) - 1)
+    return x[index], y[index]
+
+class FrequencyGraph:
+    """
+    One reusable message-frequency figure. `update` swaps the plotted data in place: sparse series are drawn
+    as bars (one PolyCollection, not a patch per bucket), dense ones as a single step line downsampled to the
+    axes width, on a date axis whose locator only formats the ticks it shows.
+    """
+    def __init__(self, figsize=(5, 4), dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot(111)
+        self.line, = self.ax.plot([], [], drawstyle='steps-post', color='steelblue', linewidth=1)
+        self.bars = self.ax.add_collection(PolyCollection([], facecolors='skyblue'))
+        self.ax.set_xlabel('Time Period', fontsize=8)
+        self.ax.set_ylabel('Number of Messages', fontsize=8)
+        self.ax.tick_params(axis='x', labelsize=7)
+        self.ax.tick_params(axis='y', labelsize=8)
+        self.figure.subplots_adjust(left=0.16, right=0.97, bottom=0.14, top=0.92)  # fixed margins: tight_layout on every update costs a full extra draw
 
+    def _lod_points(self):
+        return max(MIN_LOD_POINTS, int(self.ax.bbox.width) * 2)
+
+    def update(self, message_counts, scale):
+        index = message_counts.index
+        if getattr(index, 'tz', None) is not None: index = index.tz_convert('UTC').tz_localize(None)
+        x = mdates.date2num(index.to_numpy(dtype='datetime64[ns]')); y = message_counts.to_numpy(dtype=float)
+        bucket = BUCKET_DAYS.get(scale, 1)
+        if len(y) <= MAX_BARS:
+            left, right = x - bucket * 0.4, x + bucket * 0.4; bottom = np.zeros_like(y)
+            self.bars.set_verts(np.stack([np.column_stack([left, bottom]), np.column_stack([left, y]), np.column_stack([right, y]), np.column_stack([right, bottom])], axis=1))
+            self.line.set_data([], [])
+        else:
+            self.bars.set_verts([])
+            self.line.set_data(*downsample_minmax(x, y, self._lod_points()))
+
+        tz = getattr(message_counts.index, 'tz', None)
+        locator = mdates.AutoDateLocator(tz=tz)
+        self.ax.xaxis.set_major_locator(locator); self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator, tz=tz))
+        self.ax.set_title(f'Messages per {scale.capitalize()}', fontsize=10)
+        if len(x): self.ax.set_xlim(x[0] - bucket, x[-1] + bucket)
+        self.ax.set_ylim(0, max(y.max() * 1.05, 1) if len(y) else 1)
+
+def create_frequency_graph(df, scale):
+    """Generates a standalone message frequency Figure from the DataFrame."""
+    logger.info(f"Generating message frequency graph with scale: {scale}")
     try:
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-
-        temp_df = df.set_index('Date')
-        
-        freq_map = {'hour': 'h', 'day': 'D', 'week': 'W-MON', 'month': 'ME'}
-        freq_code = freq_map.get(scale.lower(), 'D')
-        
-        message_counts = temp_df.resample(freq_code).size()
-
-        # Plot with numerical index first
-        ax.bar(range(len(message_counts)), message_counts.values, color='skyblue')
-
-        # Generate and set custom labels
-        date_format = '%Y-%m-%d'
-        if scale == 'month': date_format = '%Y-%m'
-        elif scale == 'hour': date_format = '%Y-%m-%d %H:%M'
-        
-        labels = [d.strftime(date_format) for d in message_counts.index]
-        ax.set_xticks(range(len(message_counts)))
-        ax.set_xticklabels(labels)
-        
-        ax.set_title(f'Messages per {scale.capitalize()}', fontsize=10)
-        ax.set_xlabel('Time Period', fontsize=8)
-        ax.set_ylabel('Number of Messages', fontsize=8)
-        
-        ax.xaxis.set_major_locator(MaxNLocator(nbins=10, integer=True))
-        fig.autofmt_xdate(rotation=45, ha='right')
-        ax.tick_params(axis='x', labelsize=7)
-        ax.tick_params(axis='y', labelsize=8)
-        fig.tight_layout()
-        
+        if df is None or df.empty:
+            logger.warning("DataFrame is empty, cannot generate graph."); return None
+        series = get_frequency_series(df, scale)
+        graph = FrequencyGraph(); graph.update(*series)
         logger.info("Graph generation successful.")
-        return fig
+        return graph.figure
     except Exception as e:
-        logger.error(f"Failed to generate graph: {e}", exc_info=True); return None
\ No newline at end of file
+        logger.error(f"Failed to generate graph: {e}", exc_info=True); return None
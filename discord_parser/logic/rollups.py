@@ -0,0 +1,62 @@
+# Authored by AI: Google's Gemini Model
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+
+HOUR_NS = 3600 * 10 ** 9
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+class DateRollups:
+    """
+    Hourly message counts of a dataset held as one NumPy array. Day, week and month series and the
+    day-of-week / hour-of-day totals are all re-bucketed from it, so no view touches the rows again.
+    Hours follow the local wall clock of the column's timezone, so zones with a half- or quarter-hour
+    offset (Asia/Kolkata, Asia/Kathmandu) bucket into the same hours and days the timestamps show.
+    """
+    def __init__(self, dates):
+        self.tz = dates.dt.tz; dates = dates.dropna()
+        values = dates.to_numpy(dtype='datetime64[ns]').view('int64')  # UTC instants for timezone-aware columns
+        if not len(values):
+            self.start = None; self.counts = np.zeros(0, dtype=np.int64); return
+        wall_clock = dates.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').view('int64') if self.tz is not None else values
+        values = values - wall_clock % HOUR_NS  # the instant each row's local hour began
+        first = values.min(); self.counts = np.bincount((values - first) // HOUR_NS)
+        self.start = pd.Timestamp(first, tz='UTC').tz_convert(self.tz) if self.tz is not None else pd.Timestamp(first)
+
+    def hourly(self):
+        if self.start is None: return pd.Series(dtype='int64')
+        return pd.Series(self.counts, index=pd.date_range(self.start, periods=len(self.counts), freq='h'))
+
+    def series(self, freq='h'):
+        """Message counts per `freq` bucket ('h', 'D', 'W-MON', 'ME'), including empty buckets."""
+        hourly = self.hourly()
+        return hourly if freq == 'h' or hourly.empty else hourly.resample(freq).sum()
+
+    def day_of_week_totals(self):
+        """Message totals indexed by day name, Monday first."""
+        hourly = self.hourly()
+        totals = np.bincount(hourly.index.dayofweek, weights=hourly.to_numpy(), minlength=7).astype(np.int64) if len(hourly) else np.zeros(7, dtype=np.int64)
+        return pd.Series(totals, index=DAY_NAMES)
+
+    def hour_of_day_totals(self):
+        """Message totals for each hour of the day that has messages."""
+        hourly = self.hourly()
+        totals = pd.Series(np.bincount(hourly.index.hour, weights=hourly.to_numpy(), minlength=24).astype(np.int64) if len(hourly) else np.zeros(24, dtype=np.int64))
+        return totals[totals > 0]
+
+_rollups = {}  # id(frame) -> DateRollups; entries are dropped when the frame is garbage collected
+_rollups_lock = threading.Lock()
+
+def get_rollups(df):
+    """Returns the DateRollups of `df`, building them on first use for each (filtered) frame."""
+    key = id(df)
+    with _rollups_lock: rollups = _rollups.get(key)
+    if rollups is None:
+        rollups = DateRollups(df['Date'])
+        with _rollups_lock: _rollups[key] = rollups
+        weakref.finalize(df, _rollups.pop, key, None)
+    return rollups
+
+def clear_rollups():
+    with _rollups_lock: _rollups.clear()
@@ -0,0 +1,155 @@
+# Authored by AI: Google's Gemini Model
+from utils.logger_setup import logger
+import codecs
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+TITLE_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.discord_csv_parser', 'url_titles.json')
+TITLE_CACHE_TTL = 7 * 24 * 3600  # seconds a fetched title stays valid
+FAILED_TITLE_TTL = 24 * 3600  # failures are remembered for less time, so a site that was down gets retried
+TITLE_FETCH_WORKERS = 16  # concurrent requests, and the size of the shared connection pool
+TITLE_FETCH_TIMEOUT = 5
+PER_HOST_INTERVAL = 0.5  # minimum seconds between two requests to the same host
+MAX_HTML_BYTES = 64 * 1024  # the <title> is in the <head>; never download more than this of a page
+MAX_TITLE_LENGTH = 200
+CACHE_SAVE_EVERY = 200  # fetched titles between cache writes, so an interrupted run keeps its progress
+USER_AGENT = 'Mozilla/5.0 (compatible; DiscordCSVParser)'
+_CHARSET_PATTERN = re.compile(rb'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)  # <meta charset> and http-equiv Content-Type
+
+def fetchable_url(url):
+    """URL_PATTERN also matches scheme-less 'www.' links; those are fetched over http."""
+    return url if '://' in url else f"http://{url}"
+
+class TitleCache:
+    """
+    Persistent url -> title map stored as JSON. Entries expire after `ttl` seconds (`failed_ttl` for URLs whose
+    title could not be fetched, stored as null). Expired entries are dropped on load.
+    """
+    def __init__(self, path=None, ttl=TITLE_CACHE_TTL, failed_ttl=FAILED_TITLE_TTL):
+        self.path = path or TITLE_CACHE_PATH; self.ttl = ttl; self.failed_ttl = failed_ttl; self._entries = None; self._dirty = False
+
+    def _load(self):
+        if self._entries is not None: return
+        self._entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: entries = json.load(f)
+        except (OSError, ValueError): return
+        now = time.time()
+        self._entries = {url: (title, fetched) for url, (title, fetched) in entries.items() if fetched + (self.ttl if title is not None else self.failed_ttl) > now}
+
+    def lookup(self, url):
+        """Returns (found, title); title is None for a remembered failure."""
+        self._load(); entry = self._entries.get(url)
+        return (True, entry[0]) if entry else (False, None)
+
+    def store(self, url, title):
+        self._load(); self._entries[url] = (title, time.time()); self._dirty = True
+
+    def save(self):
+        if not self._dirty: return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f: json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(temp_path, self.path); self._dirty = False
+        except OSError as e: logger.warning(f"Could not save URL title cache: {e}")
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least `interval` seconds apart; different hosts never wait on each other."""
+    def __init__(self, interval=PER_HOST_INTERVAL):
+        self.interval = interval; self._next_slot = {}; self._lock = threading.Lock()
+
+    def wait(self, host):
+        with self._lock:
+            now = time.monotonic(); slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.interval
+        if slot > now: time.sleep(slot - now)
+
+def decode_html(body, content_type=''):
+    """
+    Decodes the start of a page: with the charset of the Content-Type header, else of a <meta> declaration in the
+    body, else as UTF-8, falling back to windows-1252 for bytes that are not UTF-8. `body` may be cut mid-character.
+    """
+    declared = _CHARSET_PATTERN.search(content_type.encode('latin-1', errors='replace')) or _META_CHARSET_PATTERN.search(body)
+    if declared:
+        try: return codecs.getincrementaldecoder(declared.group(1).decode('ascii'))(errors='replace').decode(body, final=False)
+        except LookupError: pass  # unknown charset name: detect as if none was declared
+    try: return codecs.getincrementaldecoder('utf-8')().decode(body, final=False)
+    except UnicodeDecodeError: return body.decode('windows-1252', errors='replace')
+
+def extract_title(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    if not soup.title or not soup.title.string: return None
+    title = ' '.join(soup.title.string.split())
+    return title[:MAX_TITLE_LENGTH] or None
+
+class URLTitleResolver:
+    """
+    Resolves page titles for many URLs at once. URLs are de-duplicated and looked up in the TitleCache first;
+    the rest are fetched concurrently by `workers` threads sharing one requests.Session (and its connection pool),
+    with a HostRateLimiter keeping each host to one request per `per_host_interval`.
+    """
+    def __init__(self, cache=None, workers=TITLE_FETCH_WORKERS, timeout=TITLE_FETCH_TIMEOUT, per_host_interval=PER_HOST_INTERVAL, session=None):
+        self.cache = cache if cache is not None else TitleCache(); self.workers = workers; self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(per_host_interval)
+        self.session = session or self._make_session(workers)
+
+    @staticmethod
+    def _make_session(workers):
+        session = requests.Session(); session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        session.mount('http://', adapter); session.mount('https://', adapter)
+        return session
+
+    def close(self): self.session.close()
+
+    def fetch_title(self, url):
+        """Fetches one page's title, reading at most MAX_HTML_BYTES; returns None for errors and non-HTML responses."""
+        target = fetchable_url(url); self.rate_limiter.wait(urlsplit(target).netloc.lower())
+        try:
+            with self.session.get(target, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                if 'html' not in response.headers.get('Content-Type', 'text/html'): return None
+                body = b''
+                for block in response.iter_content(16 * 1024):
+                    body += block
+                    if len(body) >= MAX_HTML_BYTES or b'</title>' in body.lower(): break
+                # requests reports ISO-8859-1 for any text/* response without a charset, so the page's own declaration is read instead
+                return extract_title(decode_html(body[:MAX_HTML_BYTES], response.headers.get('Content-Type', '')))
+        except (requests.RequestException, ValueError) as e:
+            logger.debug(f"Could not fetch title for {url}: {e}"); return None
+
+    def resolve(self, urls, progress_callback=None, cancel_token=None):
+        """
+        Returns {url: title or None} for the distinct `urls`. `progress_callback(done, total)` follows the fetches;
+        a `cancel_token` drops queued fetches. Titles fetched so far are always written to the cache.
+        """
+        titles = {}; missing = []
+        for url in dict.fromkeys(urls):
+            found, title = self.cache.lookup(url)
+            if found: titles[url] = title
+            else: missing.append(url)
+        logger.info(f"Resolving titles for {len(titles) + len(missing)} distinct URLs ({len(titles)} cached, {len(missing)} to fetch).")
+        if not missing: return titles
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='TitleFetch')
+        try:
+            futures = {executor.submit(self.fetch_title, url): url for url in missing}
+            for done, future in enumerate(as_completed(futures), start=1):
+                if cancel_token is not None and cancel_token.cancelled:
+                    for pending in futures: pending.cancel()
+                    cancel_token.raise_if_cancelled()
+                url = futures[future]; titles[url] = future.result(); self.cache.store(url, titles[url])
+                if done % CACHE_SAVE_EVERY == 0: self.cache.save()
+                if progress_callback: progress_callback(done, len(missing))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True); self.cache.save()
+        return titles
@@ -0,0 +1,67 @@
+# Authored by AI: Google's Gemini Model
+import numpy as np
+import pandas as pd
+
+WORD_STATS_MODES = ('exact', 'approximate')
+_POWERS_OF_TWO = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+
+def _hash_words(content):
+    """Splits a Content chunk on whitespace; returns the token count and the 64-bit hashes of the chunk's distinct lowercased tokens."""
+    # One join + split per chunk is far cheaper than str.split().explode(); the joined string is bounded by the chunk size.
+    tokens = content.dropna().astype(object).str.cat(sep=' ').lower().split()
+    # Both counters only need distinct words, so only the chunk's vocabulary is hashed, not every token
+    return len(tokens), pd.util.hash_array(np.array(list(set(tokens)), dtype=object)) if tokens else np.empty(0, dtype=np.uint64)
+
+class ExactWordCounter:
+    """
+    Streams word totals chunk by chunk; unique words are kept as a sorted array of 64-bit hashes (8 bytes each).
+    Each chunk's hashes are queued and merged into it only once the queue outgrows it, so the vocabulary is not re-sorted per chunk.
+    """
+    MIN_PENDING = 1 << 20  # queued hashes (8 MB) below which no merge is forced
+
+    def __init__(self):
+        self.total = 0
+        self._hashes = np.empty(0, dtype=np.uint64); self._pending = []; self._pending_count = 0
+
+    def update(self, content):
+        count, hashes = _hash_words(content)
+        self.total += count
+        self._pending.append(hashes); self._pending_count += len(hashes)
+        if self._pending_count > max(self.MIN_PENDING, 4 * len(self._hashes)): self._merge()
+
+    def _merge(self):
+        if self._pending: self._hashes = np.unique(np.concatenate([self._hashes] + self._pending))
+        self._pending = []; self._pending_count = 0
+
+    @property
+    def unique(self):
+        self._merge()
+        return len(self._hashes)
+
+class ApproximateWordCounter:
+    """HyperLogLog estimate of unique words in constant memory (2**precision one-byte registers, ~0.8% error at 14)."""
+    def __init__(self, precision=14):
+        self.total = 0; self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, content):
+        count, hashes = _hash_words(content)
+        self.total += count
+        if not len(hashes): return
+        buckets = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+        bit_length = np.searchsorted(_POWERS_OF_TWO, remainder, side='right')
+        ranks = np.minimum(64 - bit_length + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    @property
+    def unique(self):
+        m = len(self.registers); alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros: estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+def make_word_counter(mode='exact'):
+    if mode not in WORD_STATS_MODES: raise ValueError(f"Unknown word statistics mode: {mode}")
+    return ExactWordCounter() if mode == 'exact' else ApproximateWordCounter()
@@ -0,0 +1,228 @@
+# Authored by AI: Google's Gemini Model
+import fnmatch
+import re
+import numpy as np
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+ROW_HEIGHT = 22
+HEADING_HEIGHT = 25  # used until the first row has been drawn and its real offset can be measured
+COLUMNS = {"selected": ("✓", 32, tk.CENTER, False), "name": ("Author", 200, tk.W, True), "id": ("Author ID", 160, tk.W, False),
+           "count": ("Messages", 80, tk.E, False), "nickname": ("Nickname", 140, tk.W, True)}
+
+class AuthorList(ttk.Frame):
+    """
+    A virtualized author list: the Treeview only ever holds as many items as fit on screen, and scrolling rewrites
+    their values from the filtered, sorted view, so 40k+ authors cost no more widgets than 20. The selection is a
+    boolean mask over the AuthorIndex codes and nicknames a dict keyed by author ID. `on_change` is called after
+    every selection change.
+    """
+    def __init__(self, parent, on_change=None):
+        super().__init__(parent)
+        self.on_change = on_change
+        self.authors = []; self.author_index = None; self.view = []; self.selected = np.zeros(0, dtype=bool); self.nickname_values = {}
+        self.offset = 0; self.visible_rows = 1; self.focus_position = None; self.nickname_editing = False
+        self._keys = []; self._last_query = ''; self._row_authors = {}; self._editor = None; self._editing_id = None
+
+        search_frame = ttk.Frame(self); search_frame.pack(fill=tk.X, pady=(0,5))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=(0,5))
+        self.search_var = tk.StringVar(); self.search_var.trace_add('write', lambda *a: self.apply_filter())
+        ttk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT)
+        self.status_var = tk.StringVar(); ttk.Label(search_frame, textvariable=self.status_var).pack(side=tk.RIGHT)
+
+        bulk_frame = ttk.Frame(self); bulk_frame.pack(fill=tk.X, pady=(0,5))
+        ttk.Label(bulk_frame, text="Name pattern:").pack(side=tk.LEFT, padx=(0,5))
+        self.pattern_var = tk.StringVar(); ttk.Entry(bulk_frame, textvariable=self.pattern_var, width=16).pack(side=tk.LEFT)
+        ttk.Label(bulk_frame, text="Min. messages:").pack(side=tk.LEFT, padx=(10,5))
+        self.min_count_var = tk.StringVar(value="0"); ttk.Spinbox(bulk_frame, from_=0, to=10**9, textvariable=self.min_count_var, width=8).pack(side=tk.LEFT)
+        ttk.Button(bulk_frame, text="Deselect Matching", command=lambda: self.select_matching(False)).pack(side=tk.RIGHT)
+        ttk.Button(bulk_frame, text="Select Matching", command=lambda: self.select_matching(True)).pack(side=tk.RIGHT, padx=5)
+
+        list_frame = ttk.Frame(self); list_frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Style().configure('AuthorList.Treeview', rowheight=ROW_HEIGHT)
+        self.tree = ttk.Treeview(list_frame, columns=list(COLUMNS), show='headings', selectmode='browse', height=1, style='AuthorList.Treeview')
+        for column, (heading, width, anchor, stretch) in COLUMNS.items():
+            self.tree.heading(column, text=heading); self.tree.column(column, width=width, anchor=anchor, stretch=stretch)
+        self.tree.tag_configure('deselected', foreground='gray')
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self._yview); self.scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<Button-1>', self._on_click)
+        self.tree.bind('<Double-1>', self._on_double_click)
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        for sequence, delta in [('<MouseWheel>', None), ('<Button-4>', -3), ('<Button-5>', 3)]:
+            self.tree.bind(sequence, lambda e, d=delta: self._scroll_by(d if d is not None else (-3 if e.delta > 0 else 3)))
+        for key, step in [('<Up>', -1), ('<Down>', 1), ('<Prior>', 'page_up'), ('<Next>', 'page_down'), ('<Home>', 'home'), ('<End>', 'end')]:
+            self.tree.bind(key, lambda e, s=step: self._move_focus(s))
+        self.tree.bind('<space>', lambda e: self._toggle_focused())
+        for key in ['<Return>', '<F2>']: self.tree.bind(key, lambda e: self._edit_focused())
+        self.set_nickname_editing(False)
+
+    # --- Data -------------------------------------------------------------------------------------------------
+
+    def set_authors(self, authors, author_index):
+        """Shows a new author list (AuthorIndex.author_data() entries) with every listed author selected and no nicknames."""
+        self._finish_edit(False)
+        self.authors = authors; self.author_index = author_index; self.nickname_values = {}
+        self.selected = np.zeros(len(author_index), dtype=bool); self.selected[[a['code'] for a in authors]] = True
+        self.refresh()
+
+    def refresh(self):
+        """Rebuilds the view after `authors` was re-sorted in place, keeping selection, nicknames and the search."""
+        self._finish_edit(True)
+        self._keys = [f"{a['name'].lower()}\x00{a['id']}" for a in self.authors]
+        self._last_query = None; self.apply_filter()
+
+    def apply_filter(self):
+        """Type-to-filter: case-insensitive substring of the name or ID. A query that extends the last one only re-checks the rows still shown."""
+        self._finish_edit(True)
+        query = self.search_var.get().strip().lower()
+        if not query: self.view = list(range(len(self.authors)))
+        else:
+            candidates = self.view if self._last_query and query.startswith(self._last_query) else range(len(self.authors))
+            keys = self._keys; self.view = [i for i in candidates if query in keys[i]]
+        self._last_query = query; self.offset = 0; self.focus_position = 0 if self.view else None
+        self._render()
+
+    def set_all(self, selected):
+        self.selected[:] = False
+        if selected: self.selected[[a['code'] for a in self.authors]] = True
+        self._changed()
+
+    def select_matching(self, selected):
+        """(De)selects every author, shown or not, whose name matches the wildcard pattern and who has at least the minimum message count."""
+        if self.author_index is None: return
+        try: min_count = int(self.min_count_var.get() or 0)
+        except ValueError: messagebox.showerror("Invalid Input", "Minimum message count must be a whole number."); return
+        pattern = self.pattern_var.get().strip()
+        matching = (self.author_index.message_counts >= min_count) & self.author_index.named
+        if pattern:
+            matches = re.compile(fnmatch.translate(pattern), re.IGNORECASE).match
+            by_name = np.zeros(len(matching), dtype=bool); by_name[[a['code'] for a in self.authors if matches(a['name'])]] = True; matching &= by_name
+        if selected: self.selected |= matching
+        else: self.selected &= ~matching
+        self._changed()
+
+    def toggle(self, code):
+        self.selected[code] = not self.selected[code]
+        self._changed()
+
+    def selected_ids(self): return self.author_index.selected_ids(self.selected) if self.author_index is not None else []
+
+    def nicknames(self):
+        """{id: nickname, or the author's name when none was entered} for the selected authors."""
+        return {a['id']: self.nickname_values.get(a['id']) or a['name'] for a in self.authors if self.selected[a['code']]}
+
+    def set_nickname_editing(self, enabled):
+        """Nicknames can only be edited (and are only shown) while the nickname format is chosen."""
+        self.nickname_editing = enabled
+        if not enabled: self._finish_edit(True)
+        self.tree.configure(displaycolumns=list(COLUMNS) if enabled else [c for c in COLUMNS if c != 'nickname'])
+
+    def _changed(self):
+        self._render()
+        if self.on_change: self.on_change()
+
+    # --- Rendering ----------------------------------------------------------------------------------------------
+
+    def _row_values(self, author):
+        return ("☑" if self.selected[author['code']] else "☐", author['name'], author['id'], f"{author['count']:,}", self.nickname_values.get(author['id'], ''))
+
+    def _render(self):
+        """Points the pooled Treeview items at view[offset:offset + visible_rows]."""
+        total = len(self.view); rows = min(self.visible_rows, total)
+        self.offset = max(0, min(self.offset, total - rows))
+        pool = self.tree.get_children()
+        if len(pool) > rows: self.tree.delete(*pool[rows:])
+        for _ in range(len(pool), rows): self.tree.insert('', 'end')
+        self._row_authors = {}
+        focus_iid = None
+        for position, iid in enumerate(self.tree.get_children(), start=self.offset):
+            author = self.authors[self.view[position]]; self._row_authors[iid] = author
+            self.tree.item(iid, values=self._row_values(author), tags=() if self.selected[author['code']] else ('deselected',))
+            if position == self.focus_position: focus_iid = iid
+        if focus_iid: self.tree.selection_set(focus_iid); self.tree.focus(focus_iid)
+        else: self.tree.selection_set(())
+        self.scrollbar.set(self.offset / total, (self.offset + rows) / total) if total else self.scrollbar.set(0, 1)
+        self.status_var.set(f"{total:,} of {len(self.authors):,} shown, {int(self.selected.sum()):,} selected")
+
+    def _on_resize(self, event):
+        pool = self.tree.get_children(); box = self.tree.bbox(pool[0]) if pool else None
+        heading = box[1] if box else HEADING_HEIGHT
+        rows = max(1, (event.height - heading) // ROW_HEIGHT)
+        if rows != self.visible_rows: self._finish_edit(True); self.visible_rows = rows; self._render()
+
+    # --- Scrolling and keyboard ---------------------------------------------------------------------------------
+
+    def _yview(self, *args):
+        if args[0] == 'moveto': self._scroll_to(round(float(args[1]) * len(self.view)))
+        elif args[0] == 'scroll': self._scroll_by(int(args[1]) * (self.visible_rows if args[2] == 'pages' else 1))
+
+    def _scroll_by(self, rows): self._scroll_to(self.offset + rows); return 'break'
+
+    def _scroll_to(self, offset):
+        self._finish_edit(True); self.offset = offset; self._render()
+
+    def _move_focus(self, step):
+        if not self.view: return 'break'
+        position = self.focus_position or 0
+        moves = {'page_up': -self.visible_rows, 'page_down': self.visible_rows, 'home': -len(self.view), 'end': len(self.view)}
+        position = max(0, min(len(self.view) - 1, position + moves.get(step, step)))
+        self.focus_position = position
+        if position < self.offset: self.offset = position
+        elif position >= self.offset + self.visible_rows: self.offset = position - self.visible_rows + 1
+        self._scroll_to(self.offset)
+        return 'break'
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._row_authors: self.focus_position = self.offset + self.tree.index(selection[0])
+
+    def _on_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if iid in self._row_authors and self.tree.identify_region(event.x, event.y) == 'cell' and self._column_at(event.x) == 'selected':
+            self.toggle(self._row_authors[iid]['code'])
+
+    def _on_double_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if iid in self._row_authors and self._column_at(event.x) == 'nickname': self._start_edit(iid); return 'break'
+
+    def _column_at(self, x):
+        column = self.tree.identify_column(x)
+        return self.tree.column(column, 'id') if column else None
+
+    def _toggle_focused(self):
+        iid = self.tree.focus()
+        if iid in self._row_authors: self.toggle(self._row_authors[iid]['code'])
+        return 'break'
+
+    # --- In-place nickname editing ------------------------------------------------------------------------------
+
+    def _edit_focused(self):
+        iid = self.tree.focus()
+        if iid in self._row_authors: self._start_edit(iid)
+        return 'break'
+
+    def _start_edit(self, iid):
+        """Opens an Entry over the nickname cell; Return or leaving the cell saves it, Escape cancels."""
+        author = self._row_authors[iid]
+        if not self.nickname_editing or not self.selected[author['code']]: return
+        box = self.tree.bbox(iid, 'nickname')
+        if not box: return
+        self._finish_edit(True)
+        self._editing_id = author['id']; self._editor = ttk.Entry(self.tree)
+        self._editor.insert(0, self.nickname_values.get(author['id'], '')); self._editor.select_range(0, tk.END)
+        self._editor.place(x=box[0], y=box[1], width=box[2], height=box[3]); self._editor.focus_set()
+        self._editor.bind('<Return>', lambda e: self._finish_edit(True))
+        self._editor.bind('<Escape>', lambda e: self._finish_edit(False))
+        self._editor.bind('<FocusOut>', lambda e: self._finish_edit(True))
+
+    def _finish_edit(self, save):
+        if self._editor is None: return
+        editor, author_id = self._editor, self._editing_id; self._editor = self._editing_id = None
+        if save:
+            nickname = editor.get().strip()
+            if nickname: self.nickname_values[author_id] = nickname
+            else: self.nickname_values.pop(author_id, None)
+        editor.destroy(); self.tree.focus_set(); self._render()
@@ -1,8 +1,11 @@
 # Authored by AI: Google's Gemini Model
 import tkinter as tk
 from tkinter import ttk, messagebox
-from logic.data_processor import BAD_WORDS_PATTERN
+import os
+from logic.bad_words import get_bad_words_matcher
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from logic.graph_handler import FrequencyGraph
+from .author_list import AuthorList
 
 class ConfigTabs(ttk.Notebook):
     def __init__(self, parent, controller):
@@ -25,6 +28,7 @@ class ConfigTabs(ttk.Notebook):
         self.datetime_tab.start_date_var.set(self.controller.loaded_data['first_date'].split(' ')[0])
         self.datetime_tab.end_date_var.set(self.controller.loaded_data['last_date'].split(' ')[0])
         self.authors_tab.sort_combo.set("By Name")
+        self.authors_tab.author_list.set_authors(self.controller.author_data, self.controller.author_index)
         self.authors_tab.on_sort_change()
 
     def get_all_settings(self):
@@ -39,19 +43,17 @@ class ConfigTabs(ttk.Notebook):
         except (AttributeError, TypeError): messagebox.showerror("Data Error", "Cannot get settings because no data is loaded."); return None
 
     def _create_authors_tab(self):
-        tab = ttk.Frame(self); tab.author_widgets = []
+        tab = ttk.Frame(self)
         controls_frame = ttk.Frame(tab); controls_frame.pack(fill=tk.X, padx=10, pady=10)
         ttk.Label(controls_frame, text="Sort by:").pack(side=tk.LEFT, padx=(0,5))
         tab.sort_combo = ttk.Combobox(controls_frame, state="readonly", values=["By Name", "By ID", "By Message Count"]); tab.sort_combo.pack(side=tk.LEFT)
         tab.sort_combo.bind("<<ComboboxSelected>>", lambda e: tab.on_sort_change())
         ttk.Button(controls_frame, text="Select All", command=lambda: tab.select_all(True)).pack(side=tk.RIGHT)
         ttk.Button(controls_frame, text="Deselect All", command=lambda: tab.select_all(False)).pack(side=tk.RIGHT, padx=5)
-        list_frame = ttk.Frame(tab); list_frame.pack(padx=10, pady=0, fill=tk.BOTH, expand=True)
-        author_canvas = tk.Canvas(list_frame, borderwidth=0); author_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=author_canvas.yview); scrollbar.pack(side=tk.RIGHT, fill="y")
-        tab.scrollable_frame = ttk.Frame(author_canvas)
-        author_canvas.configure(yscrollcommand=scrollbar.set); author_canvas.create_window((0, 0), window=tab.scrollable_frame, anchor="nw")
-        tab.scrollable_frame.bind("<Configure>", lambda e: author_canvas.configure(scrollregion=author_canvas.bbox("all")))
+        tab.author_list = AuthorList(tab, on_change=lambda: [tab.update_options_state(), self.controller.start_analytics_task()])
+        tab.author_list.pack(padx=10, pady=0, fill=tk.BOTH, expand=True)
+        for column, sort_key in {"name": "By Name", "id": "By ID", "count": "By Message Count"}.items():
+            tab.author_list.tree.heading(column, command=lambda k=sort_key: [tab.sort_combo.set(k), tab.on_sort_change()])
         options_frame = ttk.LabelFrame(tab, text="Formatting Options"); options_frame.pack(padx=10, pady=10, fill=tk.X, side=tk.BOTTOM)
         tab.format_var = tk.StringVar(value="name")
         author_opts = {"Name Only": "name_only", "ID Only": "id_only", "Author ID & Name": "both", "Use Numeric Keys": "numeric_keys", "Use Custom Nickname": "nickname", "Anonymize": "anonymize", "Omit Author": "omit"}
@@ -73,25 +75,18 @@ class ConfigTabs(ttk.Notebook):
             if sort_key == "By Name": self.controller.author_data.sort(key=lambda x: x['name'].lower())
             elif sort_key == "By ID": self.controller.author_data.sort(key=lambda x: int(x['id']))
             elif sort_key == "By Message Count": self.controller.author_data.sort(key=lambda x: x['count'], reverse=True)
-            populate_author_list_ui()
-        def populate_author_list_ui():
-            for child in tab.scrollable_frame.winfo_children(): child.destroy()
-            tab.author_widgets.clear()
-            for author in self.controller.author_data:
-                var = tk.BooleanVar(value=True); frame = ttk.Frame(tab.scrollable_frame); frame.pack(fill='x', expand=True, padx=2, pady=1)
-                check = ttk.Checkbutton(frame, text=f"{author['name']} ({author['count']} msgs)", variable=var, command=lambda: [tab.update_options_state(), self.controller.start_analytics_task()]); check.pack(side='left', fill='x', expand=True)
-                entry = ttk.Entry(frame, width=20, state=tk.DISABLED); entry.pack(side='right')
-                tab.author_widgets.append({'id': author['id'], 'var': var, 'entry': entry, 'name': author['name']})
+            tab.author_list.refresh()
             tab.update_options_state()
         def update_options_state():
             format_val = tab.format_var.get()
-            is_nickname = format_val == "nickname"
             can_have_key = format_val in ["anonymize", "numeric_keys"]
-            for widgets in tab.author_widgets: widgets['entry'].config(state=tk.NORMAL if is_nickname and widgets['var'].get() else tk.DISABLED)
+            tab.author_list.set_nickname_editing(format_val == "nickname")
             tab.create_key_checkbutton.config(state=tk.NORMAL if can_have_key else tk.DISABLED)
-        tab.on_sort_change = on_sort_change; tab.select_all = lambda s: [w['var'].set(s) for w in tab.author_widgets] and update_options_state() and self.controller.start_analytics_task()
-        tab.update_options_state = update_options_state; tab.get_selected_author_ids = lambda: [w['id'] for w in tab.author_widgets if w['var'].get()]
-        tab.get_settings = lambda: {"author_format": tab.format_var.get(), "create_key_file": tab.create_key_var.get(), "selected_author_ids": tab.get_selected_author_ids(), "nicknames": {w['id']: w['entry'].get() or w['name'] for w in tab.author_widgets if w['var'].get()}, "group_consecutive": tab.group_consecutive_var.get(), "scrub_author_from_content": tab.scrub_content_var.get()}
+        def select_all(selected):
+            tab.author_list.set_all(selected)
+        tab.on_sort_change = on_sort_change; tab.select_all = select_all
+        tab.update_options_state = update_options_state; tab.get_selected_author_ids = tab.author_list.selected_ids
+        tab.get_settings = lambda: {"author_format": tab.format_var.get(), "create_key_file": tab.create_key_var.get(), "selected_author_ids": tab.get_selected_author_ids(), "nicknames": tab.author_list.nicknames(), "group_consecutive": tab.group_consecutive_var.get(), "scrub_author_from_content": tab.scrub_content_var.get()}
         return tab
 
     def _create_datetime_tab(self):
@@ -109,9 +104,13 @@ class ConfigTabs(ttk.Notebook):
         tab.date_format_var = tk.StringVar(value="show")
         date_opts = {"Show (Timestamp)": "show", "Hide Date": "hide", "Relative (from first)": "relative_first", "Relative (from last)": "relative_last", "Unix Timestamp": "unix"}
         for text, val in date_opts.items(): ttk.Radiobutton(date_format_frame, text=text, variable=tab.date_format_var, value=val).pack(anchor=tk.W, padx=5)
-        def display_graph(figure):
-            if hasattr(tab, 'graph_canvas') and tab.graph_canvas: tab.graph_canvas.get_tk_widget().destroy()
-            if figure: tab.graph_canvas = FigureCanvasTkAgg(figure, master=tab.graph_frame); tab.graph_canvas.draw(); tab.graph_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        tab.frequency_graph = None; tab.graph_canvas = None
+        def display_graph(series):
+            # One figure and canvas live for the whole session; new data is swapped into the existing artists
+            if tab.frequency_graph is None:
+                tab.frequency_graph = FrequencyGraph(); tab.graph_canvas = FigureCanvasTkAgg(tab.frequency_graph.figure, master=tab.graph_frame)
+                tab.graph_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            tab.frequency_graph.update(*series); tab.graph_canvas.draw_idle()
         tab.display_graph = display_graph
         tab.get_settings = lambda: {"date_format": tab.date_format_var.get()}
         return tab
@@ -143,12 +142,16 @@ class ConfigTabs(ttk.Notebook):
         ttk.Radiobutton(radio_frame, text="Disabled", variable=tab.bad_word_filter_mode, value="disabled", command=toggle_snip_entry).pack(side=tk.LEFT, padx=5)
         ttk.Radiobutton(radio_frame, text="Snip Word", variable=tab.bad_word_filter_mode, value="snip_word", command=toggle_snip_entry).pack(side=tk.LEFT, padx=5)
         ttk.Radiobutton(radio_frame, text="Snip Message", variable=tab.bad_word_filter_mode, value="snip_message", command=toggle_snip_entry).pack(side=tk.LEFT, padx=5)
-        if not BAD_WORDS_PATTERN:
+        if not get_bad_words_matcher():
             for child in filter_frame.winfo_children(): child.configure(state='disabled')
         entry_frame = ttk.Frame(filter_frame); entry_frame.pack(fill=tk.X, padx=5, pady=5)
         ttk.Label(entry_frame, text="Replacement Text:").pack(side=tk.LEFT, padx=5)
         tab.snip_entry = ttk.Entry(entry_frame, textvariable=tab.snip_replacement_var); tab.snip_entry.pack(side=tk.LEFT, padx=5)
         toggle_snip_entry()
+        perf_frame = ttk.LabelFrame(tab, text="Performance"); perf_frame.pack(padx=10, pady=10, fill=tk.X, side=tk.BOTTOM)
+        tab.parallel_var = tk.BooleanVar(value=False); tab.parallel_workers_var = tk.StringVar(value=str(os.cpu_count() or 2))
+        ttk.Checkbutton(perf_frame, text="Process content in parallel, worker processes:", variable=tab.parallel_var).pack(side=tk.LEFT, padx=5)
+        ttk.Spinbox(perf_frame, from_=2, to=64, textvariable=tab.parallel_workers_var, width=5).pack(side=tk.LEFT)
         url_frame = ttk.LabelFrame(tab, text="URL Formatting"); url_frame.pack(padx=10, pady=10, fill=tk.X, side=tk.BOTTOM)
         tab.shorten_urls_var = tk.BooleanVar(value=False); 
         def toggle_url_options():
@@ -161,8 +164,9 @@ class ConfigTabs(ttk.Notebook):
         ttk.Radiobutton(tab.url_options_frame, text="Generic Tags (<link>, <youtube>)", variable=tab.url_format_mode, value="tag_generic", command=cmd).pack(anchor=tk.W)
         ttk.Radiobutton(tab.url_options_frame, text="Domain Tags (<domain.com>)", variable=tab.url_format_mode, value="tag_domain", command=cmd).pack(anchor=tk.W)
         ttk.Radiobutton(tab.url_options_frame, text="Remove URL", variable=tab.url_format_mode, value="blank", command=cmd).pack(anchor=tk.W)
+        ttk.Radiobutton(tab.url_options_frame, text="Page Title (<title>, fetched on export)", variable=tab.url_format_mode, value="title", command=cmd).pack(anchor=tk.W)
         toggle_url_options()
-        tab.get_settings = lambda: {"trim_logic": tab.trim_logic_var.get(), "trim_chars_min_enabled": tab.trim_chars_min_enabled.get(), "trim_chars_min": int(tab.trim_chars_min_var.get()), "trim_chars_max_enabled": tab.trim_chars_max_enabled.get(), "trim_chars_max": int(tab.trim_chars_max_var.get()), "trim_words_min_enabled": tab.trim_words_min_enabled.get(), "trim_words_min": int(tab.trim_words_min_var.get()), "trim_words_max_enabled": tab.trim_words_max_enabled.get(), "trim_words_max": int(tab.trim_words_max_var.get()), "bad_word_filter_mode": tab.bad_word_filter_mode.get(), "snip_replacement": tab.snip_replacement_var.get(), "shorten_urls": tab.shorten_urls_var.get(), "url_format_mode": tab.url_format_mode.get(), "normalize_whitespace": tab.normalize_whitespace_var.get(), "omit_brackets": tab.omit_brackets_var.get()}
+        tab.get_settings = lambda: {"trim_logic": tab.trim_logic_var.get(), "trim_chars_min_enabled": tab.trim_chars_min_enabled.get(), "trim_chars_min": int(tab.trim_chars_min_var.get()), "trim_chars_max_enabled": tab.trim_chars_max_enabled.get(), "trim_chars_max": int(tab.trim_chars_max_var.get()), "trim_words_min_enabled": tab.trim_words_min_enabled.get(), "trim_words_min": int(tab.trim_words_min_var.get()), "trim_words_max_enabled": tab.trim_words_max_enabled.get(), "trim_words_max": int(tab.trim_words_max_var.get()), "bad_word_filter_mode": tab.bad_word_filter_mode.get(), "snip_replacement": tab.snip_replacement_var.get(), "shorten_urls": tab.shorten_urls_var.get(), "url_format_mode": tab.url_format_mode.get(), "normalize_whitespace": tab.normalize_whitespace_var.get(), "omit_brackets": tab.omit_brackets_var.get(), "parallel_workers": int(tab.parallel_workers_var.get()) if tab.parallel_var.get() else 0}
         return tab
 
     def _create_attachments_tab(self):
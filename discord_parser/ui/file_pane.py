@@ -2,6 +2,8 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+from logic.cache_handler import clear_cache, get_cache_size
+from logic.export_writers import COLUMNAR_FORMATS, COMPRESSION_CODECS, TXT_LAYOUTS, available_codecs, available_formats
 
 class FilePane(ttk.Frame):
     def __init__(self, parent, controller):
@@ -18,6 +20,7 @@ class FilePane(ttk.Frame):
         file_mgmt_frame = ttk.Frame(upload_frame); file_mgmt_frame.pack(fill=tk.X, padx=5, pady=(0,5))
         self.open_file_btn = ttk.Button(file_mgmt_frame, text="Open File", command=self.open_loaded_file, state=tk.DISABLED); self.open_file_btn.pack(side=tk.LEFT, expand=True, fill=tk.X)
         self.open_folder_btn = ttk.Button(file_mgmt_frame, text="Open Folder", command=self.open_loaded_folder, state=tk.DISABLED); self.open_folder_btn.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        ttk.Button(upload_frame, text="Clear Cache", command=self.clear_parsed_cache).pack(padx=5, pady=(0,5), fill=tk.X)
         details_frame = ttk.LabelFrame(self, text="File Details"); details_frame.pack(padx=10, pady=10, fill=tk.X)
         self.details_messages_label = ttk.Label(details_frame, text="Total Messages: -"); self.details_messages_label.pack(padx=5, pady=2, anchor=tk.W)
         self.details_authors_label = ttk.Label(details_frame, text="Total Authors: -"); self.details_authors_label.pack(padx=5, pady=2, anchor=tk.W)
@@ -25,22 +28,45 @@ class FilePane(ttk.Frame):
         self.details_unique_words_label = ttk.Label(details_frame, text="Unique Words: -"); self.details_unique_words_label.pack(padx=5, pady=2, anchor=tk.W)
         self.details_date_range_label = ttk.Label(details_frame, text="Date Range: -"); self.details_date_range_label.pack(padx=5, pady=2, anchor=tk.W)
         self.details_size_label = ttk.Label(details_frame, text="File Size: -"); self.details_size_label.pack(padx=5, pady=2, anchor=tk.W)
+        self.details_memory_label = ttk.Label(details_frame, text="Memory: -", justify=tk.LEFT, font=("Courier New", 8)); self.details_memory_label.pack(padx=5, pady=2, anchor=tk.W)
         export_details_frame = ttk.LabelFrame(self, text="Export Details"); export_details_frame.pack(padx=10, pady=10, fill=tk.X)
         ttk.Button(export_details_frame, text="Preview Export Settings", command=self.show_export_settings).pack(fill=tk.X, padx=5, pady=5)
         export_frame = ttk.LabelFrame(self, text="Export"); export_frame.pack(padx=10, pady=10, fill=tk.X, side=tk.BOTTOM)
-        self.compress_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(export_frame, text="Compress output to a .zip file", variable=self.compress_var).pack(padx=5, pady=(0,5))
+        compress_frame = ttk.Frame(export_frame); compress_frame.pack(fill=tk.X, padx=5, pady=(5,0))
+        ttk.Label(compress_frame, text="Compression:").pack(side=tk.LEFT)
+        self.compression_var = tk.StringVar(value="None")
+        compression_combo = ttk.Combobox(compress_frame, textvariable=self.compression_var, values=["None"] + available_codecs(), state="readonly", width=6); compression_combo.pack(side=tk.LEFT, padx=(5,0))
+        compression_combo.bind("<<ComboboxSelected>>", self._on_compression_change)
+        ttk.Label(compress_frame, text="Level:").pack(side=tk.LEFT, padx=(10,0))
+        self.compression_level_var = tk.IntVar(value=6)
+        self.compression_level_spin = ttk.Spinbox(compress_frame, from_=0, to=9, textvariable=self.compression_level_var, width=4, state=tk.DISABLED); self.compression_level_spin.pack(side=tk.LEFT, padx=(5,0))
+        layout_frame = ttk.Frame(export_frame); layout_frame.pack(fill=tk.X, padx=5, pady=(5,0))
+        ttk.Label(layout_frame, text="TXT layout:").pack(side=tk.LEFT)
+        self.txt_layout_var = tk.StringVar(value=TXT_LAYOUTS[0])
+        ttk.Combobox(layout_frame, textvariable=self.txt_layout_var, values=TXT_LAYOUTS, state="readonly", width=6).pack(side=tk.LEFT, padx=(5,0))
         self.export_csv_btn = ttk.Button(export_frame, text="Export as CSV", command=lambda: self.trigger_export('csv')); self.export_csv_btn.pack(padx=5, pady=5, fill=tk.X)
         self.export_txt_btn = ttk.Button(export_frame, text="Export as TXT", command=lambda: self.trigger_export('txt')); self.export_txt_btn.pack(padx=5, pady=5, fill=tk.X)
+        typed_frame = ttk.Frame(export_frame); typed_frame.pack(fill=tk.X, padx=5, pady=(0,5))
+        self.typed_export_btns = {}
+        for export_format, label in [('parquet', "Parquet"), ('arrow', "Arrow"), ('jsonl', "JSONL")]:
+            self.typed_export_btns[export_format] = ttk.Button(typed_frame, text=label, command=lambda f=export_format: self.trigger_export(f), state=tk.NORMAL if export_format in available_formats() else tk.DISABLED)
+            self.typed_export_btns[export_format].pack(side=tk.LEFT, expand=True, fill=tk.X)
         export_mgmt_frame = ttk.Frame(export_frame); export_mgmt_frame.pack(fill=tk.X, padx=5, pady=(0,5))
         self.open_export_btn = ttk.Button(export_mgmt_frame, text="Open Last Export", command=self.open_exported_file, state=tk.DISABLED); self.open_export_btn.pack(side=tk.LEFT, expand=True, fill=tk.X)
         self.open_export_folder_btn = ttk.Button(export_mgmt_frame, text="Open Folder", command=self.open_exported_folder, state=tk.DISABLED); self.open_export_folder_btn.pack(side=tk.LEFT, expand=True, fill=tk.X)
         ttk.Label(export_frame, text="Last Export:").pack(padx=5, pady=(10, 2), anchor=tk.W)
         self.export_preview_label = ttk.Label(export_frame, text="Size: - | Lines: -"); self.export_preview_label.pack(padx=5, pady=2, anchor=tk.W)
     
+    def _on_compression_change(self, event=None):
+        codec = self.compression_var.get()
+        if codec not in COMPRESSION_CODECS: self.compression_level_spin.config(state=tk.DISABLED); return
+        _, (lowest, highest), default = COMPRESSION_CODECS[codec]
+        self.compression_level_spin.config(state=tk.NORMAL, from_=lowest, to=highest); self.compression_level_var.set(default)
+
     def set_busy_state(self, is_busy):
         state = tk.DISABLED if is_busy else tk.NORMAL
         self.load_button.config(state=state); self.export_csv_btn.config(state=state); self.export_txt_btn.config(state=state)
+        for export_format, btn in self.typed_export_btns.items(): btn.config(state=state if export_format in available_formats() else tk.DISABLED)  # Parquet/Arrow stay disabled without pyarrow
 
     def select_file(self):
         filepath = filedialog.askopenfilename(title="Select a Discord CSV file", filetypes=(("CSV Files", "*.csv"), ("All files", "*.*")))
@@ -49,21 +75,33 @@ class FilePane(ttk.Frame):
 
     def update_with_new_data(self, data):
         self.controller.loaded_data = data; self.controller.loaded_filepath = data['filepath']
-        self.filepath_label.config(text=os.path.basename(data['filepath']))
+        self.filepath_label.config(text=os.path.basename(data['filepath']) + (" (cached)" if data.get('from_cache') else ""))
         self.details_messages_label.config(text=f"Total Messages: {data['total_messages']}"); self.details_authors_label.config(text=f"Total Authors: {data['total_authors']}")
         self.details_words_label.config(text=f"Total Words: {data['total_words']}"); self.details_unique_words_label.config(text=f"Unique Words: {data['unique_words']}")
         self.details_date_range_label.config(text=f"Date Range: {data['date_range_days']}"); self.details_size_label.config(text=f"File Size: {data['size']}")
-        self.controller.filtered_dataframe = data['dataframe']; self.controller.author_data = data['authors']
+        self.details_memory_label.config(text=self._format_memory_report(data.get('memory_usage', {})))
+        self.controller.filtered_dataframe = data['dataframe']; self.controller.author_data = data['authors']; self.controller.author_index = data['author_index']
         self.controller.config_tabs.update_on_new_data()
         self.controller.start_graph_task(); self.controller.start_analytics_task()
         self.open_file_btn.config(state=tk.NORMAL); self.open_folder_btn.config(state=tk.NORMAL)
 
+    @staticmethod
+    def _format_memory_report(memory_usage):
+        if not memory_usage: return "Memory: -"
+        lines = [f"Memory: {sum(memory_usage.values()) / 1024 / 1024:.2f} MB"]
+        lines += [f"  {col[:12]:<12} {nbytes / 1024:>10,.1f} KB" for col, nbytes in memory_usage.items()]
+        return "\n".join(lines)
+
     def trigger_export(self, export_format):
         if self.controller.filtered_dataframe is None: messagebox.showwarning("Export Warning", "Please load data before exporting."); return
         save_path = filedialog.asksaveasfilename(title=f"Save {export_format.upper()} as...", filetypes=[(f"{export_format.upper()} file", f"*.{export_format}")], defaultextension=f".{export_format}")
         if not save_path: return
-        compress = self.compress_var.get()
-        self.controller.start_export_task(export_format, save_path, compress)
+        codec = self.compression_var.get() if export_format not in COLUMNAR_FORMATS else None  # Parquet/Arrow compress internally
+        level = None
+        if codec in COMPRESSION_CODECS:
+            try: level = self.compression_level_var.get()
+            except tk.TclError: pass  # empty or non-numeric spinbox: use the codec default
+        self.controller.start_export_task(export_format, save_path, codec if codec in COMPRESSION_CODECS else None, level, self.txt_layout_var.get())
         
     def update_after_export(self, result):
         final_path = result['final_path']
@@ -72,6 +110,11 @@ class FilePane(ttk.Frame):
         self.export_preview_label.config(text=f"Size: {result['final_size']} | Lines: {result['line_count']}")
         messagebox.showinfo("Export Successful", f"File successfully saved to:\n{final_path}")
 
+    def clear_parsed_cache(self):
+        if not messagebox.askyesno("Clear Cache", f"Delete all cached parsed files ({get_cache_size() / 1024 / 1024:.1f} MB)?"): return
+        removed, freed = clear_cache()
+        messagebox.showinfo("Cache Cleared", f"Removed {removed} cached file(s), freeing {freed / 1024 / 1024:.1f} MB.")
+
     def show_export_settings(self):
         settings = self.controller.config_tabs.get_all_settings()
         if not settings: return
@@ -79,7 +122,9 @@ class FilePane(ttk.Frame):
         for key, val in settings.items():
             if key in ["selected_author_ids", "nicknames"]: msg += f"{key.replace('_',' ').title()}: {len(val)} items\n"
             else: msg += f"{key.replace('_',' ').title()}: {val}\n"
-        msg += f"Compress Output: {self.compress_var.get()}"
+        codec = self.compression_var.get()
+        msg += f"TXT Layout: {self.txt_layout_var.get()}\n"
+        msg += f"Compression: {codec}" + (f" (level {self.compression_level_spin.get()})" if codec in COMPRESSION_CODECS else "")
         messagebox.showinfo("Export Settings Preview", msg)
 
     def open_loaded_file(self): os.startfile(self.controller.loaded_filepath) if self.controller.loaded_filepath and os.path.exists(self.controller.loaded_filepath) else messagebox.showwarning("File Not Found", "The original file could not be found.")
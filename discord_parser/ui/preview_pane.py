@@ -1,6 +1,6 @@
 # Authored by AI: Google's Gemini Model
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 
 class PreviewPane(ttk.Frame):
     def __init__(self, parent, controller):
@@ -19,11 +19,54 @@ class PreviewPane(ttk.Frame):
         self.preview_text = tk.Text(self.preview_frame, state='disabled', wrap='word', background="#f0f0f0", font=("Courier New", 9), borderwidth=0)
         self.preview_text.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
 
+        # Collapsible "Performance" section: stage timings of the last export, with JSON / Chrome trace dumps
+        self.metrics = None
+        self.performance_frame = ttk.Frame(self); self.performance_frame.pack(padx=10, pady=(0,5), fill=tk.X, side=tk.BOTTOM)
+        self.performance_toggle = ttk.Button(self.performance_frame, text="▶ Performance", command=self.toggle_performance); self.performance_toggle.pack(fill=tk.X)
+        self.performance_body = ttk.Frame(self.performance_frame)
+        self.trace_memory_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.performance_body, text="Trace memory on next export (slower)", variable=self.trace_memory_var).pack(anchor=tk.W, pady=(5,0))
+        self.performance_text = tk.Text(self.performance_body, state='disabled', wrap='none', height=10, background="#f0f0f0", font=("Courier New", 8), borderwidth=0)
+        self.performance_text.pack(fill=tk.X, pady=5)
+        dump_frame = ttk.Frame(self.performance_body); dump_frame.pack(fill=tk.X)
+        self.save_metrics_btn = ttk.Button(dump_frame, text="Save JSON", command=lambda: self.save_metrics('json'), state=tk.DISABLED); self.save_metrics_btn.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self.save_trace_btn = ttk.Button(dump_frame, text="Save Chrome Trace", command=lambda: self.save_metrics('trace'), state=tk.DISABLED); self.save_trace_btn.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self._set_performance_text("No export has run yet.")
+
     def update_text(self, text):
         self.preview_text.config(state='normal')
         self.preview_text.delete('1.0', tk.END)
         self.preview_text.insert('1.0', text)
         self.preview_text.config(state='disabled')
 
+    def toggle_performance(self):
+        if self.performance_body.winfo_ismapped(): self.performance_body.pack_forget(); self.performance_toggle.config(text="▶ Performance")
+        else: self.performance_body.pack(fill=tk.X); self.performance_toggle.config(text="▼ Performance")
+
+    def _set_performance_text(self, text):
+        self.performance_text.config(state='normal')
+        self.performance_text.delete('1.0', tk.END)
+        self.performance_text.insert('1.0', text)
+        self.performance_text.config(state='disabled')
+
+    def update_performance(self, metrics):
+        self.metrics = metrics
+        self._set_performance_text(metrics.format_report() if metrics else "No metrics were recorded.")
+        state = tk.NORMAL if metrics else tk.DISABLED
+        self.save_metrics_btn.config(state=state); self.save_trace_btn.config(state=state)
+
+    def save_metrics(self, kind):
+        if not self.metrics: return
+        label = "Chrome trace" if kind == 'trace' else "metrics JSON"
+        path = filedialog.asksaveasfilename(title=f"Save {label} as...", filetypes=[("JSON file", "*.json")], defaultextension=".json")
+        if not path: return
+        try:
+            if kind == 'trace': self.metrics.dump_chrome_trace(path)
+            else: self.metrics.dump_json(path)
+        except OSError as e: messagebox.showerror("Save Error", f"Could not save the {label}.\n\nError: {e}")
+
+    def is_memory_tracing_enabled(self):
+        return self.trace_memory_var.get()
+
     def is_live_analytics_enabled(self):
         return self.live_analytics_var.get()
\ No newline at end of file
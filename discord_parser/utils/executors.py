@@ -0,0 +1,27 @@
+# Authored by AI: Google's Gemini Model
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from utils.logger_setup import logger
+
+_process_pool = None; _process_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def get_process_pool(workers):
+    """
+    Returns the process pool shared by all CPU-bound pure-Python stages, so worker processes (and their imports)
+    are started once per session rather than once per export or analytics run. The pool is replaced when a
+    different worker count is requested; work already submitted to the old pool still completes.
+    """
+    global _process_pool, _process_pool_workers
+    with _pool_lock:
+        if _process_pool is None or _process_pool_workers != workers:
+            if _process_pool is not None: _process_pool.shutdown(wait=False)
+            logger.info(f"Starting shared process pool with {workers} workers.")
+            _process_pool = ProcessPoolExecutor(max_workers=workers); _process_pool_workers = workers
+        return _process_pool
+
+def shutdown_pools():
+    global _process_pool, _process_pool_workers
+    with _pool_lock:
+        if _process_pool is not None: _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None; _process_pool_workers = 0
@@ -0,0 +1,88 @@
+# Authored by AI: Google's Gemini Model
+import itertools
+import threading
+from collections import OrderedDict
+from utils.logger_setup import logger
+
+class TaskCancelled(Exception):
+    """Raised inside a task whose CancellationToken was cancelled because a newer request superseded it."""
+
+class CancellationToken:
+    """Shared flag between the scheduler and a running task; long loops call `raise_if_cancelled` between steps."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self): self._event.set()
+
+    @property
+    def cancelled(self): return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set(): raise TaskCancelled()
+
+LANE_THREADS = {'interactive': 2, 'bulk': 1}  # worker threads per lane; one bulk thread keeps loads and exports in order
+
+class _Lane:
+    def __init__(self, name, threads, run):
+        self.name = name; self.pending = OrderedDict(); self.condition = threading.Condition()
+        self.threads = [threading.Thread(target=run, args=(self,), name=f"{name.capitalize()}Worker-{i + 1}", daemon=True) for i in range(threads)]
+        for thread in self.threads: thread.start()
+
+class TaskScheduler:
+    """
+    Runs tasks on background threads split into lanes, so short interactive work (graph, analytics) never waits
+    behind bulk work (loading, exporting). Each lane has its own queue and LANE_THREADS workers; pandas/NumPy
+    work releases the GIL, so lanes genuinely overlap. Tasks of a coalescing kind keep only the newest request:
+    submitting one replaces a queued task of that kind and cancels the running one, whose token then reads as
+    cancelled so its result can be recognised as stale. The bulk lane has a single worker, so loads and exports run
+    one at a time in submission order and never act on the same state at once.
+    Results are handed to `post(kind, result, token)` on the worker thread; failures are posted as
+    ('error', (kind, exception), token) so the receiver can tell which lane failed.
+    """
+    def __init__(self, post, coalesce_kinds=(), interactive_kinds=()):
+        self._post = post; self._coalesce_kinds = set(coalesce_kinds); self._interactive_kinds = set(interactive_kinds)
+        self._latest = {}; self._sequence = itertools.count(); self._lock = threading.Lock(); self._stopped = False
+        self._lanes = {name: _Lane(name, threads, self._run) for name, threads in LANE_THREADS.items()}
+
+    def submit(self, kind, func, args=(), kwargs=None, cancellable=False):
+        """Queues func(*args, **kwargs); `cancellable` tasks also receive the returned token as `cancel_token`."""
+        token = CancellationToken(); kwargs = dict(kwargs or {})
+        if cancellable: kwargs['cancel_token'] = token
+        lane = self._lanes[self.lane_of(kind)]
+        with self._lock:
+            if kind in self._coalesce_kinds:
+                previous = self._latest.get(kind)
+                if previous is not None: previous.cancel()
+                self._latest[kind] = token; key = kind
+            else: key = (kind, next(self._sequence))
+        with lane.condition:
+            lane.pending.pop(key, None); lane.pending[key] = (kind, func, args, kwargs, token)
+            lane.condition.notify()
+        return token
+
+    def lane_of(self, kind): return 'interactive' if kind in self._interactive_kinds else 'bulk'
+
+    def shutdown(self):
+        self._stopped = True
+        with self._lock:
+            for token in self._latest.values(): token.cancel()
+        for lane in self._lanes.values():
+            with lane.condition:
+                for _, _, _, _, token in lane.pending.values(): token.cancel()
+                lane.pending.clear(); lane.condition.notify_all()
+
+    def _run(self, lane):
+        while True:
+            with lane.condition:
+                while not lane.pending and not self._stopped: lane.condition.wait()
+                if self._stopped: return
+                _, (kind, func, args, kwargs, token) = lane.pending.popitem(last=False)
+            try:
+                result = func(*args, **kwargs)
+                if token.cancelled: logger.info(f"Dropped stale '{kind}' result.")
+                else: self._post(kind, result, token)
+            except TaskCancelled:
+                logger.info(f"Cancelled superseded '{kind}' task.")
+            except Exception as e:
+                logger.critical(f"Unhandled exception in '{kind}' task: {e}", exc_info=True)
+                self._post('error', (kind, e), token)
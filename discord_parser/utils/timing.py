@@ -1,18 +1,142 @@
 # Authored by AI: Google's Gemini Model
+import json
+import os
+import threading
 import time
+import tracemalloc
+from collections import OrderedDict
 from utils.logger_setup import logger
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_active = threading.local()  # the MetricsRegistry Timers on this thread record into, if any
+
+def _current_rss():
+    """Resident set size of this process in bytes, or None where it cannot be read without psutil."""
+    if psutil is not None: return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm', 'r') as f: return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError): return None
+
+class Span:
+    """One timed stage: offsets are seconds since the registry started; memory figures are bytes (None when unknown)."""
+    __slots__ = ('name', 'path', 'depth', 'thread', 'start', 'duration', 'rows', 'rss_delta', 'peak_memory', '_rss_start', '_traced_start', '_traced_peak')
+
+    def to_dict(self):
+        return {'name': self.name, 'path': self.path, 'depth': self.depth, 'thread': self.thread, 'start': round(self.start, 6), 'duration': round(self.duration, 6),
+                'rows': self.rows, 'rows_per_s': round(self.rows / self.duration) if self.rows and self.duration else None,
+                'rss_delta': self.rss_delta, 'peak_memory': self.peak_memory}
+
+class MetricsRegistry:
+    """
+    Collects nested stage spans. Activate it on a thread (`with registry:`) and every Timer entered there records a
+    Span with its duration, optional row count, RSS change and, with `trace_memory`, the tracemalloc peak above the
+    memory in use when the span started. tracemalloc is process-wide, so peaks of overlapping threads mix.
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory; self.spans = []; self.origin = time.perf_counter()
+        self._lock = threading.Lock(); self._stacks = threading.local(); self._started_tracing = False
+
+    def __enter__(self):
+        self._previous = getattr(_active, 'registry', None); _active.registry = self
+        if self.trace_memory and not tracemalloc.is_tracing(): tracemalloc.start(); self._started_tracing = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _active.registry = self._previous
+        if self._started_tracing: tracemalloc.stop(); self._started_tracing = False
+
+    def _stack(self):
+        if not hasattr(self._stacks, 'spans'): self._stacks.spans = []
+        return self._stacks.spans
+
+    def _update_peaks(self):
+        """Folds the tracemalloc peak since the last reset into every open span, then resets it for the next span."""
+        if not tracemalloc.is_tracing(): return
+        peak = tracemalloc.get_traced_memory()[1]
+        for span in self._stack(): span._traced_peak = max(span._traced_peak, peak)
+        tracemalloc.reset_peak()
+
+    def open(self, name, rows=None):
+        self._update_peaks()
+        stack = self._stack(); span = Span()
+        span.name = name; span.path = ' / '.join([s.name for s in stack] + [name]); span.depth = len(stack); span.thread = threading.current_thread().name
+        span.rows = rows; span.duration = 0.0; span.rss_delta = span.peak_memory = None; span._rss_start = _current_rss()
+        span._traced_start = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None; span._traced_peak = span._traced_start or 0
+        span.start = time.perf_counter() - self.origin
+        stack.append(span)
+        return span
+
+    def close(self, span):
+        span.duration = time.perf_counter() - self.origin - span.start
+        self._update_peaks(); stack = self._stack()
+        if span in stack: stack.remove(span)
+        rss = _current_rss()
+        if rss is not None and span._rss_start is not None: span.rss_delta = rss - span._rss_start
+        if span._traced_start is not None and tracemalloc.is_tracing(): span.peak_memory = span._traced_peak - span._traced_start
+        with self._lock: self.spans.append(span)
+
+    def summary(self):
+        """Spans aggregated by path, in first-start order: calls, total seconds, rows, rows/s and largest memory figures."""
+        totals = OrderedDict()
+        for span in sorted(self.spans, key=lambda s: s.start):
+            entry = totals.setdefault(span.path, {'path': span.path, 'name': span.name, 'depth': span.depth, 'calls': 0, 'seconds': 0.0, 'rows': None, 'peak_memory': None, 'rss_delta': None})
+            entry['calls'] += 1; entry['seconds'] += span.duration
+            if span.rows is not None: entry['rows'] = (entry['rows'] or 0) + span.rows
+            for key in ['peak_memory', 'rss_delta']:
+                if getattr(span, key) is not None: entry[key] = max(entry[key] or 0, getattr(span, key))
+        for entry in totals.values(): entry['rows_per_s'] = round(entry['rows'] / entry['seconds']) if entry['rows'] and entry['seconds'] else None
+        return list(totals.values())
+
+    def format_report(self):
+        lines = [f"{'Stage':<34} {'Calls':>5} {'Time':>8} {'Rows/s':>11} {'Memory':>9}"]
+        for entry in self.summary():
+            memory = entry['peak_memory'] if entry['peak_memory'] is not None else entry['rss_delta']
+            rate = f"{entry['rows_per_s']:,}" if entry['rows_per_s'] is not None else '-'
+            memory = f"{memory / 1024 / 1024:.1f} MB" if memory is not None else '-'
+            lines.append(f"{('  ' * entry['depth'] + entry['name'])[:34]:<34} {entry['calls']:>5} {entry['seconds']:>7.2f}s {rate:>11} {memory:>9}")
+        lines.append("Memory: " + ("tracemalloc peak above the stage's start" if self.trace_memory else "change in process RSS"))
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {'trace_memory': self.trace_memory, 'summary': self.summary(), 'spans': [span.to_dict() for span in sorted(self.spans, key=lambda s: s.start)]}
+
+    def dump_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f: json.dump(self.to_dict(), f, indent=2)
+
+    def dump_chrome_trace(self, path):
+        """Writes the spans in Chrome's Trace Event format (load it in chrome://tracing or Perfetto)."""
+        threads = {name: i for i, name in enumerate(dict.fromkeys(span.thread for span in self.spans))}
+        events = [{'name': span.name, 'ph': 'X', 'ts': round(span.start * 1e6), 'dur': round(span.duration * 1e6), 'pid': os.getpid(), 'tid': threads[span.thread],
+                   'args': {key: value for key, value in span.to_dict().items() if key in ('rows', 'rows_per_s', 'rss_delta', 'peak_memory') and value is not None}}
+                  for span in self.spans]
+        events += [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}} for name, tid in threads.items()]
+        with open(path, 'w', encoding='utf-8') as f: json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
 
 class Timer:
-    """A context manager to time and log code blocks."""
-    def __init__(self, description="Process"):
+    """
+    A context manager to time and log code blocks. Inside an active MetricsRegistry it also records a Span;
+    set `rows` (in the constructor or on the timer before the block ends) to get throughput. `log=False` keeps
+    stages that repeat per chunk out of the log while still recording them.
+    """
+    def __init__(self, description="Process", rows=None, log=True):
         self.description = description
+        self.rows = rows
+        self.log = log
         self.start_time = None
+        self.elapsed = None
+        self._span = None
 
     def __enter__(self):
-        logger.info(f"[TIMER] {self.description}...")
+        if self.log: logger.info(f"[TIMER] {self.description}...")
+        registry = getattr(_active, 'registry', None)
+        if registry is not None: self._span = registry.open(self.description, self.rows); self._registry = registry
         self.start_time = time.perf_counter()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        elapsed_time = time.perf_counter() - self.start_time
-        logger.info(f"[TIMER] {self.description}... Done ({elapsed_time:.2f}s)")
\ No newline at end of file
+        self.elapsed = time.perf_counter() - self.start_time
+        if self._span is not None: self._span.rows = self.rows; self._registry.close(self._span)
+        if self.log: logger.info(f"[TIMER] {self.description}... Done ({self.elapsed:.2f}s)")
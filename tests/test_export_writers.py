@@ -0,0 +1,60 @@
+# Authored by AI: Google's Gemini Model
+"""Typed exports (JSONL, Parquet, Arrow) whose leading chunks are emptied by the author selection."""
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'discord_parser')))
+
+from cli import DEFAULT_SETTINGS
+from logic.data_processor import export_data
+from logic.file_handler import load_csv_file
+
+CHUNK_SIZE = 1000
+
+@pytest.fixture
+def loaded(tmp_path):
+    """1,500 messages by alice followed by 1,500 by bob, so selecting bob empties the first export chunk."""
+    count = 3000
+    pd.DataFrame({
+        'AuthorID': [111] * 1500 + [222] * 1500, 'Author': ['alice'] * 1500 + ['bob'] * 1500,
+        'Date': pd.date_range('2021-01-01', periods=count, freq='min').strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+        'Content': [f'hello {i}' for i in range(count)], 'Attachments': [''] * count, 'Reactions': [''] * count,
+    }).to_csv(tmp_path / 'export.csv', index=False)
+    return load_csv_file(str(tmp_path / 'export.csv'), use_cache=False)
+
+def export(loaded, tmp_path, export_format, selected_author_ids):
+    df = loaded['dataframe']
+    settings = dict(DEFAULT_SETTINGS, author_format='both', group_consecutive=True, selected_author_ids=selected_author_ids,
+                    first_date_timestamp=df['Date'].min(), last_date_timestamp=df['Date'].max())
+    result = export_data(df, settings, export_format, str(tmp_path / f'out.{export_format}'), lambda percentage, message: None,
+                         chunk_size=CHUNK_SIZE, author_index=loaded['author_index'])
+    assert result['success'], result.get('error')
+    return result['final_path']
+
+def read_columnar(path, export_format):
+    pa = pytest.importorskip('pyarrow')
+    if export_format == 'parquet': return pytest.importorskip('pyarrow.parquet').read_table(path)
+    with pa.ipc.open_file(path) as reader: return reader.read_all()
+
+def test_jsonl_ids_stay_integers_after_empty_first_chunk(loaded, tmp_path):
+    with open(export(loaded, tmp_path, 'jsonl', [222]), encoding='utf-8') as f: rows = [json.loads(line) for line in f]
+    assert len(rows) == 1500
+    assert rows[0]['AuthorID'] == 222 and all(row['AuthorID'] is None for row in rows[1:])  # grouped under the first message
+
+@pytest.mark.parametrize('export_format', ['parquet', 'arrow'])
+def test_columnar_schema_after_empty_first_chunk(loaded, tmp_path, export_format):
+    pytest.importorskip('pyarrow')
+    table = read_columnar(export(loaded, tmp_path, export_format, [222]), export_format)
+    assert table.num_rows == 1500
+    assert str(table.schema.field('AuthorID').type) == 'int64' and str(table.schema.field('Content').type) in ('string', 'large_string')
+    assert table.column('AuthorID').to_pylist()[0] == 222
+
+@pytest.mark.parametrize('export_format', ['parquet', 'arrow'])
+def test_columnar_export_without_rows(loaded, tmp_path, export_format):
+    pytest.importorskip('pyarrow')
+    table = read_columnar(export(loaded, tmp_path, export_format, [999]), export_format)
+    assert table.num_rows == 0 and 'Content' in table.column_names
@@ -0,0 +1,47 @@
+# Authored by AI: Google's Gemini Model
+"""DateRollups against pandas computed straight from the rows, across whole- and non-whole-hour UTC offsets."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'discord_parser')))
+
+from logic.rollups import DateRollups
+
+TIMEZONES = [None, 'UTC', 'America/New_York', 'Asia/Kolkata', 'Asia/Kathmandu']
+
+def make_dates(tz, count=5000, seed=7):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2023-01-01').value; end = pd.Timestamp('2024-01-01').value
+    dates = pd.Series(pd.to_datetime(np.sort(rng.integers(start, end, count)), utc=tz is not None))
+    return dates.dt.tz_convert(tz) if tz is not None else dates
+
+@pytest.mark.parametrize('tz', TIMEZONES)
+@pytest.mark.parametrize('freq', ['h', 'D', 'W-MON', 'ME'])
+def test_series_matches_resample(tz, freq):
+    dates = make_dates(tz)
+    expected = dates.to_frame('Date').set_index('Date').resample(freq).size()
+    pd.testing.assert_series_equal(DateRollups(dates).series(freq), expected, check_names=False, check_freq=False)
+
+@pytest.mark.parametrize('tz', TIMEZONES)
+def test_totals_match_wall_clock(tz):
+    dates = make_dates(tz); rollups = DateRollups(dates)
+    day_totals = rollups.day_of_week_totals()
+    assert day_totals[day_totals > 0].to_dict() == dates.dt.day_name().value_counts().to_dict()
+    assert rollups.hour_of_day_totals().to_dict() == dates.dt.hour.value_counts().sort_index().to_dict()
+
+@pytest.mark.parametrize('tz', ['Asia/Kolkata', 'Asia/Kathmandu'])
+def test_hours_start_on_local_hour(tz):
+    dates = pd.Series(pd.to_datetime(['2023-03-01 10:50', '2023-03-01 11:10', '2023-03-01 23:59'])).dt.tz_localize(tz)
+    hourly = DateRollups(dates).hourly()
+    assert hourly.index[0] == pd.Timestamp('2023-03-01 10:00', tz=tz)
+    assert hourly.loc[pd.Timestamp('2023-03-01 11:00', tz=tz)] == 1
+    assert DateRollups(dates).series('D').tolist() == [3]
+
+def test_empty():
+    dates = pd.Series(pd.to_datetime([])).dt.tz_localize('Asia/Kolkata')
+    assert DateRollups(dates).series('D').empty
+    assert DateRollups(dates).day_of_week_totals().sum() == 0
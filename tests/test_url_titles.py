@@ -0,0 +1,69 @@
+# Authored by AI: Google's Gemini Model
+"""URLTitleResolver against fixed pages served by a local http.server."""
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'discord_parser')))
+
+from logic.url_titles import TitleCache, URLTitleResolver
+
+PAGES = {  # path -> (Content-Type, body)
+    '/utf8': ('text/html', '<html><head><title>Café ☕ naïve</title></head></html>'.encode('utf-8')),
+    '/meta-latin1': ('text/html', '<html><head><meta charset="iso-8859-1"><title>Crème brûlée</title></head></html>'.encode('latin-1')),
+    '/http-equiv': ('text/html', '<meta http-equiv="Content-Type" content="text/html; charset=windows-1251"><title>Привет</title>'.encode('cp1251')),
+    '/header-charset': ('text/html; charset=shift_jis', '<title>日本語のページ</title>'.encode('shift_jis')),
+    '/windows-1252': ('text/html', '<title>Smart “quotes”</title>'.encode('cp1252')),
+    '/spaced': ('text/html', b'<title>\n  Lots   of\n space </title>'),
+    '/plain': ('text/plain', b'<title>not html</title>'),
+}
+
+class _Handler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        if self.path not in PAGES:
+            self.send_error(404); return
+        content_type, body = PAGES[self.path]
+        self.send_response(200); self.send_header('Content-Type', content_type); self.send_header('Content-Length', str(len(body))); self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args): pass
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True); thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown(); httpd.server_close()
+
+@pytest.fixture
+def resolver(tmp_path):
+    resolver = URLTitleResolver(cache=TitleCache(str(tmp_path / 'titles.json')), workers=4, timeout=2, per_host_interval=0)
+    yield resolver
+    resolver.close()
+
+@pytest.mark.parametrize('path, title', [
+    ('/utf8', 'Café ☕ naïve'), ('/meta-latin1', 'Crème brûlée'), ('/http-equiv', 'Привет'),
+    ('/header-charset', '日本語のページ'), ('/windows-1252', 'Smart “quotes”'), ('/spaced', 'Lots of space'),
+    ('/plain', None), ('/missing', None),
+])
+def test_fetch_title(server, resolver, path, title):
+    assert resolver.fetch_title(server + path) == title
+
+def test_resolve_fetches_each_url_once_and_caches(server, tmp_path):
+    urls = [server + path for path in ('/utf8', '/meta-latin1', '/missing', '/utf8')]
+    _Handler.requests_seen.clear()
+    first = URLTitleResolver(cache=TitleCache(str(tmp_path / 'titles.json')), workers=4, timeout=2, per_host_interval=0)
+    try: titles = first.resolve(urls)
+    finally: first.close()
+    assert titles == {urls[0]: 'Café ☕ naïve', urls[1]: 'Crème brûlée', urls[2]: None}
+    assert sorted(_Handler.requests_seen) == ['/meta-latin1', '/missing', '/utf8']
+    second = URLTitleResolver(cache=TitleCache(str(tmp_path / 'titles.json')), workers=4, timeout=2, per_host_interval=0)
+    try: assert second.resolve(urls) == titles
+    finally: second.close()
+    assert len(_Handler.requests_seen) == 3  # titles and the failure come from the saved cache